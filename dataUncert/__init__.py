@@ -21,7 +21,7 @@ def addStreamHandler(lgr):
                 stack = stack.split('\n')
                 stack = stack[:len(stack) - 3]
                 stack = '\n'.join(stack)
-                return record.msg + "\nOrigin :\n" + "".join(stack)
+                return record.getMessage() + "\nOrigin :\n" + "".join(stack)
 
     # overload the streamhandler class in order to exit after emitting
 
@@ -51,7 +51,7 @@ def setLogLevel(level):
             msg += f' - {record.name}{" "*(21 - len(record.name))}'
             msg += f' - Line {record.lineno}{" "*(3-len(str(record.lineno)))}'
             msg += f' - {record.levelname}{" "*(8 - len(record.levelname))}'
-            msg += f' - {record.msg}'
+            msg += f' - {record.getMessage()}'
             if record.levelno in (logging.ERROR, logging.CRITICAL):
                 stack = filter(
                     lambda line: ("lib/logging/__init__.py" not in line)
@@ -82,9 +82,10 @@ def setLogLevel(level):
 
 
 # import the necessary modules
-from dataUncert.variable import variable
+from dataUncert.variable import variable, setLazyUncertanty, setPrintOptions
 from dataUncert.fit import dummy_fit, pol_fit, lin_fit, exp_fit, pow_fit, logistic_fit, logistic_100_fit
-from dataUncert.readData import readData
+from dataUncert.readData import readData, readCsv
 import dataUncert.constant as constant
 from dataUncert.prop import prop
 from dataUncert.solve import solve
+from dataUncert.trace import trace
@@ -0,0 +1,201 @@
+import io
+import os
+import logging
+import tempfile
+import timeit
+import numpy as np
+import openpyxl
+from openpyxl.utils import get_column_letter
+from dataUncert import variable, setPrintOptions, readData, readCsv
+
+
+def benchmark(description, func, number):
+    t = timeit.timeit(func, number=number) / number
+    print(f'{description:<60} {t * 1000:10.3f} ms')
+    return t
+
+
+def benchmarkLogging(n=10000, number=20):
+    print(f'Logging - {n} datapoints')
+
+    a = variable(np.linspace(1, 2, n), 'L/min', np.linspace(0.01, 0.02, n))
+    b = variable(np.linspace(3, 4, n), 'kg/L', np.linspace(0.03, 0.04, n))
+
+    # the log messages are only formatted if they are emitted
+    benchmark('a * b, log messages are not emitted', lambda: a * b, number)
+
+    # emit the log messages to a stream. This formats all messages, which is what always happened before
+    logger = logging.getLogger('dataUncert')
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    benchmark('a * b, log messages are emitted', lambda: a * b, number)
+    logger.removeHandler(handler)
+    print('')
+
+
+def benchmarkPower(n=1000000, number=5):
+    print(f'Power - {n} datapoints')
+
+    a = variable(np.linspace(1, 2, n), 'm2', np.linspace(0.01, 0.02, n))
+    b = variable(np.linspace(1, 2, n), '1', np.linspace(0.01, 0.02, n))
+    c = variable(0.7, '1', 0.01)
+
+    benchmark('a**2', lambda: a**2, number)
+    benchmark('a**3', lambda: a**3, number)
+    benchmark('a**0.5', lambda: a**0.5, number)
+    benchmark('b**-1', lambda: b**-1, number)
+    benchmark('b**2.3', lambda: b**2.3, number)
+    benchmark('b**c, the exponent has an uncertanty', lambda: b**c, number)
+    print('')
+
+
+def benchmarkScalarOperations(number=20000):
+    print('Scalar operations')
+
+    a = variable(1.2, 'L/min', 0.01)
+    b = variable(3.4, 'kg/L', 0.03)
+    c = variable(5.6, 'L/min', 0.05)
+
+    # the cost of the operations on scalars is dominated by the creation of the resulting variable
+    benchmark('a * b', lambda: a * b, number)
+    benchmark('a / b', lambda: a / b, number)
+    benchmark('a + c', lambda: a + c, number)
+    benchmark('a**2', lambda: a**2, number)
+    benchmark('a[0]', lambda: a[0], number)
+    print('')
+
+
+def benchmarkPrinting(n=50000, number=3):
+    print(f'Printing - {n} datapoints')
+
+    a = variable(np.linspace(1, 2, n), 'L/min', np.linspace(0.01, 0.02, n))
+    b = variable(np.linspace(1, 2000, n), 'L/min', np.linspace(10, 20, n))
+
+    setPrintOptions(threshold=None)
+    benchmark('str(a), uncertanties smaller than 1', lambda: str(a), number)
+    benchmark('str(b), uncertanties larger than 1', lambda: str(b), number)
+    setPrintOptions()
+    benchmark('str(a), summary', lambda: str(a), number)
+    benchmark('a.getRounded()', lambda: a.getRounded(), number)
+    benchmark('b.getRounded()', lambda: b.getRounded(), number)
+    print('')
+
+
+def writeWorkbook(xlsxFile, rows, nSheets=1, writeOnly=True):
+    # A workbook written in write only mode does not store the dimensions of the sheets like excel does
+    wb = openpyxl.Workbook(write_only=writeOnly)
+    if not writeOnly:
+        wb.remove(wb.active)
+    for _ in range(nSheets):
+        sheet = wb.create_sheet()
+        for row in rows:
+            sheet.append(row)
+    wb.save(xlsxFile)
+
+
+def benchmarkReadData(nRows=100000, nCols=20, number=1):
+    print(f'readData - {nRows} rows with {nCols} coloumns of data and {nCols} coloumns of uncertanty')
+
+    rng = np.random.default_rng(0)
+    headers = [f'x{i}' for i in range(nCols)] + [f'u{i}' for i in range(nCols)]
+    units = ['m'] * nCols + ['m'] * nCols
+    dataRange = f'A-{get_column_letter(nCols)}'
+    uncertRange = f'{get_column_letter(nCols + 1)}-{get_column_letter(2 * nCols)}'
+
+    with tempfile.TemporaryDirectory() as directory:
+        xlsxFile = os.path.join(directory, 'data.xlsx')
+        writeWorkbook(xlsxFile, [headers, units] + rng.random([nRows, 2 * nCols]).tolist())
+        benchmark('.xlsx', lambda: readData(xlsxFile, dataRange, uncertRange), number)
+
+        # xlwt is only used to create the .xls file. An .xls file can not have more than 65536 rows
+        try:
+            import xlwt
+        except ImportError:
+            print('xlwt is not installed. The .xls file is not benchmarked')
+            return
+        nRowsXls = min(nRows, 65536 - 2)
+        xlsFile = os.path.join(directory, 'data.xls')
+        wb = xlwt.Workbook()
+        sheet = wb.add_sheet('s1')
+        for i, row in enumerate([headers, units] + rng.random([nRowsXls, 2 * nCols]).tolist()):
+            for j, elem in enumerate(row):
+                sheet.write(i, j, elem)
+        wb.save(xlsFile)
+        benchmark(f'.xls, {nRowsXls} rows', lambda: readData(xlsFile, dataRange, uncertRange), number)
+    print('')
+
+
+def benchmarkReadCovariance(nDataPoints=2000, nCols=20, number=1):
+    print(f'readData - {nDataPoints} datapoints of {nCols} correlated coloumns')
+
+    # each datapoint has a symmetric covariance matrix of nCols x nCols in the uncertanty
+    rng = np.random.default_rng(0)
+    headers = [f'x{i}' for i in range(nCols)] + [f'u{i}' for i in range(nCols)]
+    units = ['m'] * nCols + ['m'] * nCols
+    covariance = rng.random([nDataPoints, nCols, nCols])
+    covariance = covariance + covariance.transpose(0, 2, 1)
+    data = np.full([nDataPoints * nCols, nCols], None, dtype=object)
+    data[0:nDataPoints] = rng.random([nDataPoints, nCols])
+    rows = np.concatenate([data, covariance.reshape(nDataPoints * nCols, nCols)], axis=1).tolist()
+    dataRange = f'A-{get_column_letter(nCols)}'
+    uncertRange = f'{get_column_letter(nCols + 1)}-{get_column_letter(2 * nCols)}'
+
+    with tempfile.TemporaryDirectory() as directory:
+        xlsxFile = os.path.join(directory, 'data.xlsx')
+        writeWorkbook(xlsxFile, [headers, units] + rows)
+        benchmark('.xlsx', lambda: readData(xlsxFile, dataRange, uncertRange), number)
+    print('')
+
+
+def benchmarkReadSheets(nSheets=8, nRows=20000, nCols=4, number=1):
+    nWorkers = os.cpu_count()
+    print(f'readData - {nSheets} sheets of {nRows} rows with {nCols} coloumns of data and {nCols} coloumns of uncertanty')
+
+    rng = np.random.default_rng(0)
+    headers = [f'x{i}' for i in range(nCols)] + [f'u{i}' for i in range(nCols)]
+    units = ['m'] * nCols + ['m'] * nCols
+    dataRange = f'A-{get_column_letter(nCols)}'
+    uncertRange = f'{get_column_letter(nCols + 1)}-{get_column_letter(2 * nCols)}'
+
+    with tempfile.TemporaryDirectory() as directory:
+        xlsxFile = os.path.join(directory, 'data.xlsx')
+        writeWorkbook(xlsxFile, [headers, units] + rng.random([nRows, 2 * nCols]).tolist(), nSheets, writeOnly=False)
+        benchmark('.xlsx, 1 worker', lambda: readData(xlsxFile, dataRange, uncertRange), number)
+        benchmark(f'.xlsx, {nWorkers} workers', lambda: readData(xlsxFile, dataRange, uncertRange, nWorkers=nWorkers), number)
+    print('')
+
+
+def benchmarkReadCsv(nRows=1000000, nCols=20, number=1):
+    print(f'readCsv - {nRows} rows with {nCols} coloumns of data and {nCols} coloumns of uncertanty')
+
+    rng = np.random.default_rng(0)
+    headers = [f'x{i}' for i in range(nCols)] + [f'u{i}' for i in range(nCols)]
+    units = ['m'] * nCols + ['m'] * nCols
+    dataRange = f'A-{get_column_letter(nCols)}'
+    uncertRange = f'{get_column_letter(nCols + 1)}-{get_column_letter(2 * nCols)}'
+
+    with tempfile.TemporaryDirectory() as directory:
+        csvFile = os.path.join(directory, 'data.csv')
+        with open(csvFile, 'w') as file:
+            file.write(','.join(headers) + '\n' + ','.join(units) + '\n')
+            for i in range(0, nRows, 100000):
+                np.savetxt(file, rng.random([min(100000, nRows - i), 2 * nCols]), delimiter=',')
+        benchmark('.csv', lambda: readCsv(csvFile, dataRange, uncertRange), number)
+        benchmark('np.loadtxt of the same file', lambda: np.loadtxt(csvFile, delimiter=',', skiprows=2), number)
+    print('')
+
+
+def main():
+    benchmarkLogging()
+    benchmarkPower()
+    benchmarkScalarOperations()
+    benchmarkPrinting()
+    benchmarkReadData()
+    benchmarkReadCovariance()
+    benchmarkReadSheets()
+    benchmarkReadCsv()
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,8 @@ from dataUncert.variable import variable
 
 
 class constant(variable):
+    __slots__ = ()
+
     def __init__(self, value, unit) -> None:
         super().__init__(value, unit)
 
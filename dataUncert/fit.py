@@ -51,7 +51,8 @@ class _fit():
 
         # determine r-squared
         np.seterr('ignore')
-        residuals = self.yVal - self.predict(self.xVal).value
+        xVar = variable._fromArrays(np.array(self.xVal, dtype=float, ndmin=1), unit(str(self.xUnit)))
+        residuals = self.yVal - self.predict(xVar).value
         np.seterr('warn')
         y_bar = np.mean(self.yVal)
         ss_res = np.sum(residuals**2)
@@ -87,10 +88,10 @@ class _fit():
 
         # scatter
         if showUncert:
-            logger.info(f'Scattering the data on the axis {ax} with uncetanties. The label is "{label}"')
+            logger.info('Scattering the data on the axis %s with uncetanties. The label is "%s"', ax, label)
             ax.errorbar(self.xVal, self.yVal, xerr=self.xUncert, yerr=self.yUncert, linestyle='', label=label, **kwargs)
         else:
-            logger.info(f'Scattering the data on the axis {ax} without uncetanties. The label is "{label}"')
+            logger.info('Scattering the data on the axis %s without uncetanties. The label is "%s"', ax, label)
             ax.scatter(self.xVal, self.yVal, label=label, **kwargs)
 
     def plotData(self, ax, label=True, **kwargs):
@@ -108,17 +109,17 @@ class _fit():
             logger.error('The label has to be a string, a bool or None')
             raise ValueError('The label has to be a string, a bool or None')
 
-        logger.info(f'Plotting the data on the axis {ax}. The label is "{label}"')
+        logger.info('Plotting the data on the axis %s. The label is "%s"', ax, label)
         ax.plot(self.xVal, self.yVal, label=label, **kwargs)
 
     def predict(self, x):
-        logger.info(f'Predicting the y-value using the input {x}')
+        logger.info('Predicting the y-value using the input %s', x)
         if not isinstance(x, variable):
             x = variable(x, self.xUnit)
         return self.func(self.popt, x)
 
     def predictDifferential(self, x):
-        logger.info(f'Predicting the differential of the y-value using the input {x}')
+        logger.info('Predicting the differential of the y-value using the input %s', x)
         if not isinstance(x, variable):
             x = variable(x, self.xUnit)
         return self.d_func(self.popt, x)
@@ -142,7 +143,7 @@ class _fit():
             x = np.linspace(np.min(self.xVal), np.max(self.xVal), 100)
         y = self.predict(x).value
         ax.plot(x, y, label=label, **kwargs)
-        logger.info(f'Plotting the regression on the axis {ax}. The label is {label}')
+        logger.info('Plotting the regression on the axis %s. The label is %s', ax, label)
 
     def plotDifferential(self, ax, label=True, x=None, **kwargs):
 
@@ -162,14 +163,14 @@ class _fit():
         if x is None:
             x = np.linspace(np.min(self.xVal), np.max(self.xVal), 100)
         ax.plot(x, self.predDifferential(x), label=label, **kwargs)
-        logger.info(f'Plotting the differential of the regression on the axis {ax}. The label is {label}')
+        logger.info('Plotting the differential of the regression on the axis %s. The label is %s', ax, label)
 
     def addUnitToLabels(self, ax):
         self.addUnitToXLabel(ax)
         self.addUnitToYLabel(ax)
 
     def addUnitToXLabel(self, ax):
-        logger.info(f'Adding the unit of the x-data to the xlabel of the axis {ax}')
+        logger.info('Adding the unit of the x-data to the xlabel of the axis %s', ax)
         xLabel = ax.get_xlabel()
         if xLabel:
             xLabel += ' '
@@ -177,7 +178,7 @@ class _fit():
         ax.set_xlabel(xLabel)
 
     def addUnitToYLabel(self, ax):
-        logger.info(f'Adding the unit of the y-data to the ylabel of the axis {ax}')
+        logger.info('Adding the unit of the y-data to the ylabel of the axis %s', ax)
         yLabel = ax.get_ylabel()
         if yLabel:
             yLabel += ' '
@@ -187,7 +188,7 @@ class _fit():
 
 class dummy_fit(_fit):
     def __init__(self, x, y, p0=None):
-        logger.info(f'Creating a dummy fitting object with the data {x} and {y}')
+        logger.info('Creating a dummy fitting object with the data %s and %s', x, y)
 
         if not (isinstance(x, variable) and isinstance(y, variable)):
             logger.error('The inputs has to be variables')
@@ -204,14 +205,13 @@ class dummy_fit(_fit):
         self.popt = [variable(1, self.yUnit)]
 
     def func(self, B, x):
-        val = self.popt[0].value
-        val = [val] * len(x.value)
-        return variable(val, self.yUnit)
+        val = np.full(x.len(), self.popt[0]._value[0], dtype=float)
+        return variable._fromArrays(val, unit(self.yUnit))
 
     def d_func(self, B, x):
-        val = [0] * len(x.value)
-        unit = (self.popt[0] / variable(1, self.xUnit)).unit
-        return variable(val, unit)
+        val = np.zeros(x.len())
+        unitStr = (self.popt[0] / variable(1, self.xUnit)).unit
+        return variable._fromArrays(val, unit(unitStr))
 
     def func_name(self):
         return f'{self.popt[0]}'
@@ -223,7 +223,7 @@ class dummy_fit(_fit):
 
 class exp_fit(_fit):
     def __init__(self, x, y, p0=[1, 1]):
-        logger.info(f'Creating a exponential fitting object with the data {x} and {y} and the initial guess of {p0}')
+        logger.info('Creating a exponential fitting object with the data %s and %s and the initial guess of %s', x, y, p0)
         if len(p0) != 2:
             logger.error('You have to provide initial guesses for 2 parameters')
             raise ValueError('You have to provide initial guesses for 2 parameters')
@@ -267,7 +267,7 @@ class exp_fit(_fit):
 
 class pow_fit(_fit):
     def __init__(self, x, y, p0=[1, 1]):
-        logger.info(f'Creating a power fitting object with the data {x} and {y} and the initial guess of {p0}')
+        logger.info('Creating a power fitting object with the data %s and %s and the initial guess of %s', x, y, p0)
 
         if len(p0) != 2:
             logger.error('You have to provide initial guesses for 2 parameters')
@@ -333,7 +333,7 @@ class pol_fit(_fit):
 
         self.deg = deg
 
-        logger.info(f'Creating a polynomial fitting object with the data {x} and {y} and the initial guess of {p0}')
+        logger.info('Creating a polynomial fitting object with the data %s and %s and the initial guess of %s', x, y, p0)
         _fit.__init__(self, self.func, x, y, p0=p0)
 
     def getPoptVariables(self):
@@ -424,7 +424,7 @@ class pol_fit(_fit):
 
 class logistic_fit(_fit):
     def __init__(self, x, y, p0=[1, 1, 1]):
-        logger.info(f'Creating a logistic fitting object with the data {x} and {y} and the initial guess of {p0}')
+        logger.info('Creating a logistic fitting object with the data %s and %s and the initial guess of %s', x, y, p0)
         if len(p0) != 3:
             logger.error('You have to provide initial guesses for 3 parameters')
             raise ValueError('You have to provide initial guesses for 3 parameters')
@@ -490,7 +490,7 @@ class logistic_fit(_fit):
 
 class logistic_100_fit(_fit):
     def __init__(self, x, y, p0=[0, 0]):
-        logger.info(f'Creating a logistic100 fitting object with the data {x} and {y} and the initial guess of {p0}')
+        logger.info('Creating a logistic100 fitting object with the data %s and %s and the initial guess of %s', x, y, p0)
 
         if len(p0) != 2:
             logger.error('You have to provide initial guesses for 2 parameters')
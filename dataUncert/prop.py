@@ -1,3 +1,4 @@
+import numpy as np
 from pyfluids import Fluid, FluidsList, Input, HumidAir, InputHumidAir
 from dataUncert import variable, unit
 
@@ -18,7 +19,7 @@ def isAllArgumentsUsed(arguments: dict):
 
 def findArgument(arguments : dict, parameterName, unitStr, raiseError = True):
 
-    desiredSIBaseUnit = unit.unit(unitStr)._SIBaseUnit
+    desiredDimension = unit.unit(unitStr)._dimension
     
     parameter = None
     if  parameterName in arguments.keys():
@@ -28,7 +29,7 @@ def findArgument(arguments : dict, parameterName, unitStr, raiseError = True):
         if raiseError:
             raise ValueError(f'Could not find an arugment matching that of a {parameterName}')
     if not parameter is None:
-        if parameter._unitObject._SIBaseUnit != desiredSIBaseUnit:
+        if parameter._unitObject._dimension != desiredDimension:
             raise ValueError(f'The input {parameterName} did not have to correct unit of {unitStr}')
 
     return arguments, parameter
@@ -99,7 +100,7 @@ def outputFromParameters(scalarMethod, property, params):
     for i, param in enumerate(params):
         if not param is None:
             if param.len() != 1:
-                paramVecs[i] = [variable(val, param.unit, unc) for val,unc in zip(param.value, param.uncert)]
+                paramVecs[i] = [variable._fromArrays(np.array([val], dtype=float), unit.unit(param.unit), np.array([unc], dtype=float)) for val, unc in zip(param._value, param._uncert)]
 
     for i in range(len(paramVecs)):
         if not paramVecs[i] is None:
@@ -113,7 +114,7 @@ def outputFromParameters(scalarMethod, property, params):
         params = [elem[i] for elem in paramVecs]
         out.append(scalarMethod(property, *params))
     
-    return variable([elem.value for elem in out], out[0].unit, [elem.uncert for elem in out])
+    return variable._fromArrays(np.array([elem.value for elem in out], dtype=float), unit.unit(out[0].unit), np.array([elem.uncert for elem in out], dtype=float))
 
 def propWater(property, arguments):
     
@@ -145,7 +146,7 @@ def propWaterScalar(property, T,P):
     
     ## create a variable from the fluid
     var = getattr(fluid, knownProperties[property])
-    var = variable(var, propertyUnits[property])
+    var = variable._fromArrays(np.array([var], dtype=float), unit.unit(propertyUnits[property]))
     vars, grads = differentials(fluid, property, [T, P])
     var._addDependents(vars, grads)
     var._calculateUncertanty()
@@ -195,7 +196,7 @@ def propMEGScalar(property, T,P,C):
     
     ## create a variable from the fluid
     var = getattr(fluid, knownProperties[property])
-    var = variable(var, propertyUnits[property])
+    var = variable._fromArrays(np.array([var], dtype=float), unit.unit(propertyUnits[property]))
     vars, grads = differentialsBrine(fluid, FluidsList.MEG, property, C, [T, P])
     var._addDependents(vars, grads)
     var._calculateUncertanty()
@@ -269,7 +270,7 @@ def propHumidAirScalar(property, T,Rh,H = None, P = None):
     
     ## create a variable from the fluid
     var = getattr(fluid, knownProperties[property])
-    var = variable(var, propertyUnits[property])
+    var = variable._fromArrays(np.array([var], dtype=float), unit.unit(propertyUnits[property]))
     Vars, grads = differentials(fluid, property, vars)
     var._addDependents(Vars, grads)
     var._calculateUncertanty()
@@ -6,19 +6,63 @@ import xlrd
 import os.path
 import re
 import string
+import itertools
+import csv
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 from dataUncert.variable import variable
+from dataUncert.unit import unit
 
 
-def readData(xlFile, dataRange, uncertRange=None):
-    logger.info(f'Creating a data object from the file {xlFile} with the dataRange {dataRange} and the uncertRange {uncertRange}')
-    dat = _readData(xlFile, dataRange, uncertRange)
+def readData(xlFile, dataRange, uncertRange=None, nWorkers=1):
+    logger.info('Creating a data object from the file %s with the dataRange %s and the uncertRange %s', xlFile, dataRange, uncertRange)
+    dat = _readData(xlFile, dataRange, uncertRange, nWorkers)
+    return dat.dat
+
+
+def readCsv(csvFile, dataRange, uncertRange=None, delimiter=None, chunkSize=2**22):
+    logger.info('Creating a data object from the file %s with the dataRange %s and the uncertRange %s', csvFile, dataRange, uncertRange)
+    dat = _readCsv(csvFile, dataRange, uncertRange, delimiter, chunkSize)
     return dat.dat
 
 
 class _readData():
 
-    def __init__(self, xlFile, dataRange, uncertRange=None) -> None:
+    def __init__(self, xlFile, dataRange, uncertRange=None, nWorkers=1) -> None:
+
+        self.readRanges(dataRange, uncertRange)
+
+        # check the extension
+        extension = os.path.splitext(xlFile)[1]
+        supportedExtensions = ['.xls', '.xlsx']
+        if extension not in supportedExtensions:
+            logger.error(f'The file extension is not supported. The supported extension are {supportedExtensions}')
+            raise ValueError(f'The file extension is not supported. The supported extension are {supportedExtensions}')
+
+        self.extension = extension
+
+        if not isinstance(nWorkers, int) or nWorkers < 1:
+            logger.error('The number of workers has to be a positive integer')
+            raise ValueError('The number of workers has to be a positive integer')
 
+        # read each sheet in a single pass into an array of the cells and decode the sheet
+        if nWorkers == 1:
+            wb = self.openWorkbook(xlFile)
+            self.sheets = [self.decodeSheet(self.readSheet(wb, i), f's{i+1}') for i in range(self.nSheets(wb))]
+            self.closeWorkbook(wb)
+        else:
+            # the sheets are read by a pool of processes, where each process opens the workbook and reads a single sheet.
+            # The sheets are returned in the order of the workbook
+            wb = self.openWorkbook(xlFile)
+            nSheets = self.nSheets(wb)
+            self.closeWorkbook(wb)
+            with ProcessPoolExecutor(min(nWorkers, nSheets)) as executor:
+                self.sheets = list(executor.map(self.readSheetFromFile, itertools.repeat(xlFile, nSheets), range(nSheets)))
+
+        # read the data
+        self.readData()
+
+    def readRanges(self, dataRange, uncertRange):
         if '-' in dataRange:
             index = dataRange.find('-')
             dataStartCol = dataRange[0:index]
@@ -68,46 +112,134 @@ class _readData():
                 raise ValueError('The number of coloumns of the data is not equal to the number of coloumns for the uncertanty')
         self.nCols = nColsData
 
-        # check the extension
-        extension = os.path.splitext(xlFile)[1]
-        supportedExtensions = ['.xls', '.xlsx']
-        if extension not in supportedExtensions:
-            logger.error(f'The file extension is not supported. The supported extension are {supportedExtensions}')
-            raise ValueError(f'The file extension is not supported. The supported extension are {supportedExtensions}')
-
-        # parse functions for the specific extension and get all sheets
-        if extension == '.xls':
-            self.wb = xlrd.open_workbook(xlFile)
-            self.sheets = self.wb.sheets()
-
-            def readCell(sheet, row, col):
-                return sheet.cell(row, col).value
-
-            def readRow(sheet, row):
-                return [elem.value for elem in sheet.row(row)]
+    def openWorkbook(self, xlFile):
+        if self.extension == '.xls':
+            # the sheets are only loaded when they are read
+            return xlrd.open_workbook(xlFile, on_demand=True)
+        # the workbook is opened in read only mode, where the rows are streamed from the file.
+        return openpyxl.load_workbook(xlFile, data_only=True, read_only=True)
 
-            def readCol(sheet, col):
-                return [elem.value for elem in sheet.col(col)]
-
-        elif extension == '.xlsx':
-            self.wb = openpyxl.load_workbook(xlFile, data_only=True)
-            self.sheets = [self.wb[elem] for elem in self.wb.sheetnames]
-
-            def readCell(sheet, row, col):
-                return sheet.cell(row + 1, col + 1).value
-
-            def readRow(sheet, row):
-                return [elem.value for elem in list(sheet.iter_rows())[row]]
-
-            def readCol(sheet, col):
-                return [elem.value for elem in list(sheet.iter_cols())[col]]
+    def closeWorkbook(self, wb):
+        if self.extension == '.xls':
+            wb.release_resources()
+        else:
+            wb.close()
+
+    def nSheets(self, wb):
+        if self.extension == '.xls':
+            return wb.nsheets
+        return len(wb.sheetnames)
+
+    def readSheet(self, wb, index):
+        if self.extension == '.xls':
+            return self.readXlsSheet(wb.sheet_by_index(index))
+        return self.readXlsxSheet(wb[wb.sheetnames[index]])
+
+    def readSheetFromFile(self, xlFile, index):
+        # used by the processes of the pool
+        wb = self.openWorkbook(xlFile)
+        sheet = self.decodeSheet(self.readSheet(wb, index), f's{index+1}')
+        self.closeWorkbook(wb)
+        return sheet
 
-        self.readCell = readCell
-        self.readRow = readRow
-        self.readCol = readCol
-
-        # read the data
-        self.readData()
+    @staticmethod
+    def readXlsSheet(sheet):
+        cells = np.full([sheet.nrows, sheet.ncols], None, dtype=object)
+        for i in range(sheet.nrows):
+            cells[i, :] = sheet.row_values(i)
+        return cells
+
+    @staticmethod
+    def readXlsxSheet(sheet):
+        # the dimensions of the sheet are used to allocate the array of the cells.
+        # The dimensions stored in the file might be wrong. Therefore the array is grown if it is too small
+        cells = np.full([sheet.max_row or 0, sheet.max_column or 0], None, dtype=object)
+        nRows = 0
+        for row in sheet.iter_rows(values_only=True):
+            if nRows == cells.shape[0] or len(row) > cells.shape[1]:
+                grownCells = np.full([max(2 * cells.shape[0], nRows + 1), max(cells.shape[1], len(row))], None, dtype=object)
+                grownCells[0:cells.shape[0], 0:cells.shape[1]] = cells
+                cells = grownCells
+            cells[nRows, 0:len(row)] = row
+            nRows += 1
+        return cells[0:nRows]
+
+    @staticmethod
+    def countRows(block):
+        # the number of cells in each coloumn of the block which are not empty
+        return np.sum(np.not_equal(block, None) & np.not_equal(block, ''), axis=0)
+
+    def decodeSheet(self, cells, name):
+        # the headers, the units, the data and the uncertanty are sliced from the cells of the sheet
+        # and the numbers are converted in bulk
+        nColsRequired = 2 * self.nCols if not self.uncertStartCol is None else self.nCols
+        if cells.shape[0] < 2 or cells.shape[1] < nColsRequired:
+            paddedCells = np.full([max(cells.shape[0], 2), max(cells.shape[1], nColsRequired)], None, dtype=object)
+            paddedCells[0:cells.shape[0], 0:cells.shape[1]] = cells
+            cells = paddedCells
+
+        headers = list(cells[0, 0:self.nCols])
+        units = list(cells[1, 0:self.nCols])
+
+        return self.decodeBlock(headers, units, self.countRows(cells[2:, 0:nColsRequired]), cells[2:, 0:nColsRequired], name)
+
+    @staticmethod
+    def indexToCol(index):
+        # converts the index of a coloumn, starting from 0, to the letters of the coloumn
+        col = ''
+        index += 1
+        while index > 0:
+            index, remainder = divmod(index - 1, 26)
+            col = string.ascii_uppercase[remainder] + col
+        return col
+
+    def toFloat(self, block, name, colOffset):
+        # the cells are converted in bulk. If this fails, the first cell, which is not a number, is found and reported.
+        # Empty cells are converted to nan by numpy, so only the cells which are nan are checked
+        try:
+            values = block.astype(float, copy=False)
+            isNan = np.isnan(values)
+            if not np.any(isNan) or not np.any(np.equal(block[isNan], None) | np.equal(block[isNan], '')):
+                return values
+        except (TypeError, ValueError):
+            pass
+        for (i, j), cell in np.ndenumerate(block):
+            try:
+                if cell is None:
+                    raise TypeError
+                float(cell)
+            except (TypeError, ValueError):
+                # the two first rows of the sheet are the headers and the units
+                cellName = f'{self.indexToCol(colOffset + j)}{i + 3}'
+                if cell is None or cell == '':
+                    logger.error(f'The cell {cellName} in the sheet {name} is empty')
+                    raise ValueError(f'The cell {cellName} in the sheet {name} is empty')
+                logger.error(f'The cell {cellName} in the sheet {name} is not a number')
+                raise ValueError(f'The cell {cellName} in the sheet {name} is not a number')
+
+    def decodeBlock(self, headers, units, nRows, block, name):
+        # the block holds the data followed by the uncertanty. nRows is the number of cells in each coloumn of the block which are not empty
+
+        # determine the number of datapoints
+        nDataPoints = nRows[0:self.nCols]
+        if not np.all(nDataPoints == nDataPoints[0]):
+            logger.error('There are not an equal amount of rows in the data')
+            raise ValueError('There are not an equal amount of rows in the data')
+        nDataPoint = int(nDataPoints[0])
+        data = self.toFloat(block[0:nDataPoint, 0:self.nCols], name, 0)
+
+        if self.uncertStartCol is None:
+            return headers, units, data, None
+
+        # determine the number of rows in the uncertanty
+        nUncertanties = nRows[self.nCols:2 * self.nCols]
+        if not np.all(nUncertanties == nUncertanties[0]):
+            logger.error('There are not an equal amount of rows in the uncertanty')
+            raise ValueError('There are not an equal amount of rows in the uncertanty')
+        nUncertanty = int(nUncertanties[0])
+        uncert = self.toFloat(block[0:nUncertanty, self.nCols:2 * self.nCols], name, self.nCols)
+
+        return headers, units, data, uncert
 
     def colToIndex(self, col):
         if col is None:
@@ -161,42 +293,14 @@ class _readData():
         self.dat = _Data()
 
         # Looping over the sheets in the data file
-        for i, sheet in enumerate(self.sheets):
+        for i, (headers, units, data, uncert) in enumerate(self.sheets):
             sheetData = _Sheet(f's{i+1}')
 
-            # determine the number of variables
-            headers = self.readRow(sheet, 0)[0:self.nCols]
             headers = self.formatHeaders(headers)
-            units = self.readRow(sheet, 1)[0:self.nCols]
-
-            # determine the number of datapoints
-            nDataPoints = []
-            for i in range(self.nCols):
-                nDataPoint = self.readCol(sheet, i)[2:]
-                nDataPoint = sum([1 if elem not in ['', None] else 0 for elem in nDataPoint])
-                nDataPoints.append(nDataPoint)
-            if not all(elem == nDataPoints[0] for elem in nDataPoints):
-                logger.error('There are not an equal amount of rows in the data')
-                raise ValueError('There are not an equal amount of rows in the data')
-            nDataPoint = nDataPoints[0]
-
-            # read the data
-            data = np.zeros([nDataPoint, self.nCols])
-            for i in range(nDataPoint):
-                for j in range(self.nCols):
-                    data[i, j] = float(self.readCell(sheet, 2 + i, j))
-
-            if not self.uncertStartCol is None:
-                # determine the number of rows in the uncertanty
-                nUncertanties = []
-                for i in range(self.nCols):
-                    nUncertanty = self.readCol(sheet, self.nCols + i)[2:]
-                    nUncertanty = sum([1 if elem not in ['', None] else 0 for elem in nUncertanty])
-                    nUncertanties.append(nUncertanty)
-                if not all(elem == nUncertanties[0] for elem in nUncertanties):
-                    logger.error('There are not an equal amount of rows in the uncertanty')
-                    raise ValueError('There are not an equal amount of rows in the uncertanty')
-                nUncertanty = nUncertanties[0]
+            nDataPoint = data.shape[0]
+
+            if not uncert is None:
+                nUncertanty = uncert.shape[0]
 
                 # evaluate the number of rows of the uncertanty
                 if nUncertanty not in [nDataPoint, nDataPoint * self.nCols]:
@@ -206,57 +310,40 @@ class _readData():
                 if nUncertanty == nDataPoint:
                     # There is one row of uncertanty for each row of data. Therefore there are no covariance data in the sheet
 
-                    # read the uncertanty
-                    uncert = np.zeros([nDataPoint, self.nCols])
-                    for i in range(nDataPoint):
-                        for j in range(self.nCols):
-                            uncert[i, j] = float(self.readCell(sheet, 2 + i, self.nCols + j))
-
                     # create the measurements uncertanties
                     for i in range(self.nCols):
                         name = headers[i]
-                        unit = units[i]
+                        unitStr = units[i]
                         val = np.array(data[:, i])
                         u = np.array(uncert[:, i])
-                        var = variable(val, unit, uncert=u)
+                        var = variable._fromArrays(val, unit(unitStr), u)
 
                         sheetData._addMeasurement(name, var)
                 else:
                     # There are covariance data in the sheet
 
-                    # read the uncertanty
-                    uncert = []
-                    for i in range(nDataPoint):
-                        u = np.zeros([self.nCols, self.nCols])
-                        for j in range(self.nCols):
-                            for k in range(self.nCols):
-                                u[j, k] = float(self.readCell(sheet, 2 + i * self.nCols + j, self.nCols + k))
-                        uncert.append(u)
-
-                    # check if each element in the uncertanty is symmetric
-                    for elem in uncert:
-                        if (elem.shape == elem.transpose().shape) and (elem == elem.transpose()).all():
-                            pass
-                        else:
-                            logger.error('The covariances has to be symmetric')
-                            raise ValueError('The covariances has to be symmetric')
+                    # the covariance matrix of each datapoint are stacked in to a (nDataPoint x nCols x nCols) array
+                    covariance = uncert.reshape(nDataPoint, self.nCols, self.nCols)
+                    if not np.array_equal(covariance, covariance.transpose(0, 2, 1)):
+                        logger.error('The covariances has to be symmetric')
+                        raise ValueError('The covariances has to be symmetric')
 
                     # create the measurements with covariance uncertanties
                     vars = []
                     for i in range(self.nCols):
                         name = headers[i]
-                        unit = units[i]
+                        unitStr = units[i]
                         val = np.array(data[:, i])
-                        u = np.array([elem[i, i] for elem in uncert])
-                        var = variable(val, unit, uncert=u)
+                        u = np.array(covariance[:, i, i])
+                        var = variable._fromArrays(val, unit(unitStr), u)
                         vars.append(var)
 
+                    # the covariances are transposed to (nCols x nCols x nDataPoint), such that each pair of variables is a contiguous slice
+                    covariance = np.ascontiguousarray(covariance.transpose(1, 2, 0))
                     for i in range(self.nCols):
-                        covariance = [elem[:, i] for elem in uncert]
                         for j in range(self.nCols):
                             if i != j:
-                                cov = [elem[j] for elem in covariance]
-                                vars[i]._addCovariance(vars[j], cov)
+                                vars[i]._addCovariance(vars[j], covariance[j, i])
 
                     for head, var in zip(headers, vars):
                         sheetData._addMeasurement(head, var)
@@ -266,14 +353,134 @@ class _readData():
                 # create the measurements without uncertanties
                 for i in range(self.nCols):
                     name = headers[i]
-                    unit = units[i]
+                    unitStr = units[i]
                     val = np.array(data[:, i])
-                    var = variable(val, unit)
+                    var = variable._fromArrays(val, unit(unitStr))
                     sheetData._addMeasurement(name, var)
 
             self.dat._addSheet(sheetData.name, sheetData)
 
 
+class _readCsv(_readData):
+
+    def __init__(self, csvFile, dataRange, uncertRange=None, delimiter=None, chunkSize=2**22) -> None:
+
+        self.readRanges(dataRange, uncertRange)
+
+        if not isinstance(chunkSize, int) or chunkSize < 1:
+            logger.error('The size of the chunks has to be a positive integer')
+            raise ValueError('The size of the chunks has to be a positive integer')
+
+        # a delimited file has a single sheet
+        self.sheets = [self.readCsvFile(csvFile, delimiter, chunkSize)]
+
+        # read the data
+        self.readData()
+
+    def readCsvFile(self, csvFile, delimiter, chunkSize):
+        nColsRequired = 2 * self.nCols if not self.uncertStartCol is None else self.nCols
+
+        # the line endings are translated to '\n' when the file is read
+        with open(csvFile, 'r', newline=None) as file:
+            header = file.readline().rstrip('\n')
+            unitRow = file.readline().rstrip('\n')
+
+            # the delimiter is the most frequent of the common delimiters in the header
+            if delimiter is None:
+                delimiter = max([',', ';', '\t'], key=header.count)
+
+            # the headers and the units are read with the csv module as they might be quoted
+            headers, units = [list(next(csv.reader([line], delimiter=delimiter))) for line in [header, unitRow]]
+            headers = (headers + [''] * self.nCols)[0:self.nCols]
+            units = (units + [''] * self.nCols)[0:self.nCols]
+
+            # the file is read in chunks of complete lines with a size of approximately chunkSize bytes.
+            # For each coloumn the number of fields, the first empty field and the last field, which is not empty, are recorded
+            nRows = np.zeros(nColsRequired, dtype=int)
+            nLines = 0
+            firstEmpty = np.full(nColsRequired, -1)
+            lastFilled = np.zeros(nColsRequired, dtype=int)
+            blocks = []
+            while True:
+                lines = file.readlines(chunkSize)
+                if not lines:
+                    break
+                # the two first lines of the file are the headers and the units
+                values, isEmpty = self.tokenize(lines, delimiter, nColsRequired, csvFile, nLines + 3)
+                isFilled = ~isEmpty
+                hasEmpty = np.any(isEmpty, axis=0) & (firstEmpty < 0)
+                firstEmpty[hasEmpty] = nLines + np.argmax(isEmpty, axis=0)[hasEmpty]
+                hasFilled = np.any(isFilled, axis=0)
+                lastFilled[hasFilled] = nLines + len(lines) - np.argmax(isFilled[::-1], axis=0)[hasFilled]
+                nRows += np.sum(isFilled, axis=0)
+                nLines += len(lines)
+                blocks.append(values)
+
+        # the fields of a coloumn can only be empty after the last number of the coloumn
+        hasGap = nRows < lastFilled
+        if np.any(hasGap):
+            j = np.flatnonzero(hasGap)[np.argmin(firstEmpty[hasGap])]
+            logger.error(f'The field in line {firstEmpty[j] + 3} and coloumn {self.indexToCol(j)} of the file {csvFile} is empty')
+            raise ValueError(f'The field in line {firstEmpty[j] + 3} and coloumn {self.indexToCol(j)} of the file {csvFile} is empty')
+
+        if blocks:
+            block = np.concatenate(blocks)
+        else:
+            block = np.zeros([0, nColsRequired])
+        return self.decodeBlock(headers, units, nRows, block, csvFile)
+
+    def tokenize(self, lines, delimiter, nCols, csvFile, firstLine):
+        # converts a chunk of lines to an array of floats with nCols coloumns. Empty fields are returned as nan.
+        # firstLine is the number of the first line of the chunk in the file
+        try:
+            # the tokenizer of numpy is used if all fields are numbers. The tokenizer skips empty lines
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                values = np.loadtxt(lines, delimiter=delimiter, usecols=range(nCols), comments=None, ndmin=2, quotechar='"')
+            if values.shape[0] == len(lines):
+                return values, np.zeros(values.shape, dtype=bool)
+        except (TypeError, ValueError):
+            pass
+
+        # the chunk has empty fields. The lines are split in to an array of strings
+        text = ''.join(lines)
+        if text.endswith('\n'):
+            text = text[:-1]
+        rows = text.split('\n')
+        nFields = np.char.count(np.array(rows), delimiter) + 1
+
+        if np.all(nFields == nFields[0]):
+            # all lines has the same number of fields. Therefore all lines are split at once
+            fields = np.array(text.replace('\n', delimiter).split(delimiter)).reshape(len(rows), nFields[0])
+            if fields.shape[1] < nCols:
+                fields = np.concatenate([fields, np.full([len(rows), nCols - fields.shape[1]], '')], axis=1)
+            fields = fields[:, 0:nCols]
+        else:
+            fields = np.full([len(rows), nCols], '', dtype=object)
+            for i, row in enumerate(rows):
+                row = row.split(delimiter)[0:nCols]
+                fields[i, 0:len(row)] = row
+            fields = fields.astype(str)
+
+        # the whitespace and the quotes around the fields are removed
+        fields = np.char.strip(fields, ' \t\r\f\v"\'')
+        isEmpty = fields == ''
+        try:
+            return np.where(isEmpty, 'nan', fields).astype(float), isEmpty
+        except ValueError:
+            pass
+
+        # the first field, which is not a number, is found and reported
+        for (i, j), field in np.ndenumerate(fields):
+            if isEmpty[i, j]:
+                continue
+            try:
+                float(field)
+            except ValueError:
+                logger.error(f'The field "{field}" in line {firstLine + i} and coloumn {self.indexToCol(j)} of the file {csvFile} is not a number')
+                raise ValueError(f'The field "{field}" in line {firstLine + i} and coloumn {self.indexToCol(j)} of the file {csvFile} is not a number')
+
+
 class _Data():
     def __init__(self, name=''):
         self.name = name
@@ -285,7 +492,7 @@ class _Data():
         if name in sheetNames:
             index = sheetNames.index(name)
             self.sheets[index] = sheet
-            logger.warning(f'A sheet with the name {name} already existed in the object {self}. The first sheet with the same name is overwritten.')
+            logger.warning('A sheet with the name %s already existed in the object %s. The first sheet with the same name is overwritten.', name, self)
             raise Warning(f'A sheet with the name {name} already existed in the object {self}. The first sheet with the same name is overwritten.')
         else:
             self.sheets.append(sheet)
@@ -321,7 +528,7 @@ class _Sheet():
 
     def __getitem__(self, index):
 
-        logger.info(f'Indexing the sheet {self} with the indexes {index}')
+        logger.info('Indexing the sheet %s with the indexes %s', self, index)
         measurements = []
         for meas in self.measurements:
             val = meas.value[index]
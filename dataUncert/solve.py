@@ -33,7 +33,7 @@ def solve(func, x, *args, bounds = None,**kwargs):
             if not isinstance(elem, variable):
                 raise ValueError('Each side of each equation has to be a variable')        
         ## test if the units match
-        if (o[0]._unitObject._SIBaseUnit != o[1]._unitObject._SIBaseUnit):
+        if (o[0]._unitObject._dimension != o[1]._unitObject._dimension):
                 raise ValueError('The units of the equations does not match')
             
 
@@ -66,7 +66,7 @@ def solve(func, x, *args, bounds = None,**kwargs):
                     if not isinstance(elem, variable):
                         raise ValueError('Each side of the bounds has to be a variable')         
                 ## check the bounds
-                if (o[0]._unitObject._SIBaseUnit != o[1]._unitObject._SIBaseUnit or o[1]._unitObject._SIBaseUnit != o[2]._unitObject._SIBaseUnit):
+                if (o[0]._unitObject._dimension != o[1]._unitObject._dimension or o[1]._unitObject._dimension != o[2]._unitObject._dimension):
                     raise ValueError('The units of the bounds does not match')
                 
                 doesUnitsOfBoundsMatch.append([o[0].unit == o[1].unit, o[1].unit == o[2].unit])
@@ -154,9 +154,10 @@ def solve(func, x, *args, bounds = None,**kwargs):
     Jinv = np.linalg.inv(J)
     
     ## add the residuals and a row of the inverse jacobian to each variable and calculate the uncertanty
+    ## the variables depend on each other. Therefore the uncertanty is evaluated right away, even if the uncertanty is lazy
     for i, xi in enumerate(x):
         xi._addDependents(residuals, Jinv[i,:])
-        xi._calculateUncertanty()
+        xi._evaluateUncertanty()
     if (n == 1 and not isVariableList): x = x[0]
     return x
 
@@ -7,6 +7,7 @@ from testUnit import test as testUnit
 from testVariable import test as testVariable
 from testProp import test as testProp
 from testSolve import test as testSolve
+from testTrace import test as testTrace
 
 def main():
     tests = [
@@ -15,7 +16,8 @@ def main():
         testUnit, 
         testVariable,
         testProp,
-        testSolve
+        testSolve,
+        testTrace
     ]
 
     suites = []
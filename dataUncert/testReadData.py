@@ -1,12 +1,34 @@
 import logging
 logging.disable(logging.CRITICAL)
 import unittest
+import os
+import tempfile
 import numpy as np
-from dataUncert.readData import readData
+import openpyxl
+from dataUncert.readData import readData, readCsv
 
 
 class test(unittest.TestCase):
 
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def writeWorkbook(self, sheets, writeOnly=False):
+        # writes a workbook with a sheet for each list of rows
+        xlFile = os.path.join(self.directory.name, f'data{len(os.listdir(self.directory.name))}.xlsx')
+        wb = openpyxl.Workbook(write_only=writeOnly)
+        if not writeOnly:
+            wb.remove(wb.active)
+        for rows in sheets:
+            sheet = wb.create_sheet()
+            for row in rows:
+                sheet.append(row)
+        wb.save(xlFile)
+        return xlFile
+
     def testReadFileTypes(self):
         # xlsx file
         dat = readData('testData/data1.xlsx', 'A-B')
@@ -54,6 +76,177 @@ class test(unittest.TestCase):
             dat6 = readData('testData/data6.xlsx', 'A-B', 'C-D')
         self.assertTrue("The covariances has to be symmetric" in str(context.exception))
 
+    def testReadCsv(self):
+        # the file is seperated by ; and has \r line endings
+        dat = readCsv('testData/data1.csv', 'A-B')
+        np.testing.assert_array_equal(dat.s1.a.value, [1, 2, 3, 4, 5])
+        self.assertEqual(str(dat.s1.a.unit), 'L/min')
+        np.testing.assert_array_equal(dat.s1.a.uncert, [0, 0, 0, 0, 0])
+        np.testing.assert_array_equal(dat.s1.b.value, [5, 6, 7, 8, 9])
+        self.assertEqual(str(dat.s1.b.unit), 'mA')
+        np.testing.assert_array_equal(dat.s1.b.uncert, [0, 0, 0, 0, 0])
+
+        dat = readCsv('testData/data1.csv', 'A-B', delimiter=';')
+        np.testing.assert_array_equal(dat.s1.b.value, [5, 6, 7, 8, 9])
+
+        # the file has the same content as data4.xlsx. The file is read in chunks of a few lines
+        datXlsx = readData('testData/data4.xlsx', 'A-B', 'C-D')
+        for chunkSize in [2**22, 16]:
+            dat = readCsv('testData/data4.csv', 'A-B', 'C-D', chunkSize=chunkSize)
+            self.assertEqual(dat.s1.measurementNames, ['b', 'a'])
+            np.testing.assert_array_equal(dat.s1.a.value, datXlsx.s1.a.value)
+            self.assertEqual(str(dat.s1.a.unit), 'L/min')
+            np.testing.assert_array_almost_equal(dat.s1.a.uncert, datXlsx.s1.a.uncert)
+            np.testing.assert_array_almost_equal(dat.s1.a.covariance[dat.s1.b], datXlsx.s1.a.covariance[datXlsx.s1.b])
+            np.testing.assert_array_equal(dat.s1.b.value, datXlsx.s1.b.value)
+            np.testing.assert_array_almost_equal(dat.s1.b.uncert, datXlsx.s1.b.uncert)
+            np.testing.assert_array_almost_equal(dat.s1.b.covariance[dat.s1.a], datXlsx.s1.b.covariance[datXlsx.s1.a])
+
+        with self.assertRaises(Exception) as context:
+            readCsv('testData/data4.csv', 'A-C')
+        self.assertTrue("There are not an equal amount of rows in the data" in str(context.exception))
+
+        csvFile = os.path.join(self.directory.name, 'data.csv')
+        for chunkSize in [2**22, 8]:
+            # the whitespace and the quotes around the fields are removed
+            with open(csvFile, 'w') as file:
+                file.write('a,b\nm,s\n 1.5 ,"2"\n"3", 4\t\n" 5 ",\'6\'\n')
+            dat = readCsv(csvFile, 'A-B', chunkSize=chunkSize)
+            np.testing.assert_array_equal(dat.s1.a.value, [1.5, 3, 5])
+            np.testing.assert_array_equal(dat.s1.b.value, [2, 4, 6])
+
+            # empty lines after the data are ignored
+            with open(csvFile, 'w') as file:
+                file.write('a,b\nm,s\n1,2\n3,4\n\n\n')
+            dat = readCsv(csvFile, 'A-B', chunkSize=chunkSize)
+            np.testing.assert_array_equal(dat.s1.a.value, [1, 3])
+
+            # an empty field within the data
+            with open(csvFile, 'w') as file:
+                file.write('a,b\nm,s\n1,2\n3,4\n5,""\n7,8\n')
+            with self.assertRaises(Exception) as context:
+                readCsv(csvFile, 'A-B', chunkSize=chunkSize)
+            self.assertTrue(f'The field in line 5 and coloumn B of the file {csvFile} is empty' in str(context.exception))
+
+            # an empty line within the data
+            with open(csvFile, 'w') as file:
+                file.write('a,b\nm,s\n1,2\n\n5,6\n')
+            with self.assertRaises(Exception) as context:
+                readCsv(csvFile, 'A-B', chunkSize=chunkSize)
+            self.assertTrue(f'The field in line 4 and coloumn A of the file {csvFile} is empty' in str(context.exception))
+
+            # an empty field within the uncertanty
+            with open(csvFile, 'w') as file:
+                file.write('a,b,a,b\nm,s,m,s\n1,2,0.1,0.2\n3,4,,0.4\n5,6,0.5,0.6\n')
+            with self.assertRaises(Exception) as context:
+                readCsv(csvFile, 'A-B', 'C-D', chunkSize=chunkSize)
+            self.assertTrue(f'The field in line 4 and coloumn C of the file {csvFile} is empty' in str(context.exception))
+
+            # a field, which is not a number
+            with open(csvFile, 'w') as file:
+                file.write('a,b\nm,s\n1,2\n3,4\n5,"6 s"\n')
+            with self.assertRaises(Exception) as context:
+                readCsv(csvFile, 'A-B', chunkSize=chunkSize)
+            self.assertTrue(f'The field "6 s" in line 5 and coloumn B of the file {csvFile} is not a number' in str(context.exception))
+
+    def testDecodeSheet(self):
+        # numbers stored as text are converted
+        xlFile = self.writeWorkbook([[['a', 'b'], ['m', 's'], ['1.5', 5], [2, '6.5']]])
+        dat = readData(xlFile, 'A-B')
+        np.testing.assert_array_equal(dat.s1.a.value, [1.5, 2])
+        np.testing.assert_array_equal(dat.s1.b.value, [5, 6.5])
+
+        # an empty row within the data
+        xlFile = self.writeWorkbook([[['a', 'b'], ['m', 's'], [1, 5], [2, 6]], [['a', 'b'], ['m', 's'], [1, 5], [None, None], [3, 7]]])
+        with self.assertRaises(Exception) as context:
+            readData(xlFile, 'A-B')
+        self.assertTrue('The cell A4 in the sheet s2 is empty' in str(context.exception))
+
+        # a cell, which is not a number
+        xlFile = self.writeWorkbook([[['a', 'b'], ['m', 's'], [1, 5], [2, 'x']]])
+        with self.assertRaises(Exception) as context:
+            readData(xlFile, 'A-B')
+        self.assertTrue('The cell B4 in the sheet s1 is not a number' in str(context.exception))
+
+        # a cell in the uncertanty, which is not a number
+        xlFile = self.writeWorkbook([[['a', 'b', 'a', 'b'], ['m', 's', 'm', 's'], [1, 5, 0.1, 0.5], [2, 6, 'x', 0.6]]])
+        with self.assertRaises(Exception) as context:
+            readData(xlFile, 'A-B', 'C-D')
+        self.assertTrue('The cell C4 in the sheet s1 is not a number' in str(context.exception))
+
+        # the sheet does not have the coloumns of the uncertanty
+        with self.assertRaises(Exception) as context:
+            readData('testData/data1.xlsx', 'A-B', 'C-D')
+        self.assertTrue('The number of rows in the uncertanty has to be equal to the number of rows of data' in str(context.exception))
+
+    def testReadStreamed(self):
+        # a workbook written in write only mode does not store the dimensions of the sheets.
+        # The rows of the sheets have different lengths
+        sheets = [
+            [['a', 'b'], ['m', 's', None, None, 'note'], [1, 5], [2, 6, None, None, 'x'], [3, 7]],
+            [['a', 'b'], ['m', 's'], [4, 8]],
+        ]
+        xlFile = self.writeWorkbook(sheets, writeOnly=True)
+        wb = openpyxl.load_workbook(xlFile, read_only=True)
+        self.assertIsNone(wb.worksheets[0].max_row)
+        wb.close()
+
+        for nWorkers in [1, 2]:
+            dat = readData(xlFile, 'A-B', nWorkers=nWorkers)
+            self.assertEqual([sheet.name for sheet in dat], ['s1', 's2'])
+            np.testing.assert_array_equal(dat.s1.a.value, [1, 2, 3])
+            np.testing.assert_array_equal(dat.s1.b.value, [5, 6, 7])
+            self.assertEqual(str(dat.s1.b.unit), 's')
+            self.assertEqual(dat.s2.a.value, 4)
+            self.assertEqual(dat.s2.b.value, 8)
+
+    def testReadCovarianceBlock(self):
+        # 2 datapoints of 3 correlated coloumns. Each datapoint has a symmetric covariance matrix
+        covariance = np.array([
+            [[0.01, 0.002, 0.003], [0.002, 0.04, 0.005], [0.003, 0.005, 0.09]],
+            [[0.04, 0.006, 0.007], [0.006, 0.09, 0.008], [0.007, 0.008, 0.16]],
+        ])
+        rows = [['a', 'b', 'c'] * 2, ['m'] * 6]
+        data = [[1, 2, 3], [4, 5, 6]]
+        for i, row in enumerate(covariance.reshape(6, 3).tolist()):
+            rows.append((data[i] if i < 2 else [None] * 3) + row)
+        xlFile = self.writeWorkbook([rows])
+
+        dat = readData(xlFile, 'A-C', 'D-F')
+        variables = [dat.s1.a, dat.s1.b, dat.s1.c]
+        for i, var_i in enumerate(variables):
+            np.testing.assert_array_equal(var_i.value, [data[0][i], data[1][i]])
+            np.testing.assert_array_equal(var_i.uncert, covariance[:, i, i])
+            for j, var_j in enumerate(variables):
+                if i != j:
+                    np.testing.assert_array_equal(var_i.covariance[var_j], covariance[:, j, i])
+        d = dat.s1.a + dat.s1.b + dat.s1.c
+        np.testing.assert_array_almost_equal(d.uncert, np.sqrt(np.sum(covariance, axis=(1, 2)) - np.sum(np.diagonal(covariance, axis1=1, axis2=2), axis=1) + np.sum(np.diagonal(covariance, axis1=1, axis2=2)**2, axis=1)))
+
+        # the second covariance matrix is not symmetric
+        rows[6][5] = 0.1
+        xlFile = self.writeWorkbook([rows])
+        with self.assertRaises(Exception) as context:
+            readData(xlFile, 'A-C', 'D-F')
+        self.assertTrue('The covariances has to be symmetric' in str(context.exception))
+
+    def testReadParallel(self):
+        dat = readData('testData/data7.xlsx', 'A-B', 'C-D')
+        datParallel = readData('testData/data7.xlsx', 'A-B', 'C-D', nWorkers=2)
+        self.assertEqual([sheet.name for sheet in datParallel], ['s1', 's2', 's3'])
+        for sheet, sheetParallel in zip(dat, datParallel):
+            self.assertEqual(sheet.measurementNames, sheetParallel.measurementNames)
+            for meas, measParallel in zip(sheet, sheetParallel):
+                np.testing.assert_array_equal(meas.value, measParallel.value)
+                np.testing.assert_array_equal(meas.uncert, measParallel.uncert)
+                self.assertEqual(str(meas.unit), str(measParallel.unit))
+        np.testing.assert_array_equal(datParallel.s3.a.value, [21, 22, 23, 24, 25])
+        np.testing.assert_array_almost_equal(datParallel.s3.b.uncert, [0.5, 0.6, 0.7, 0.8, 0.9])
+
+        with self.assertRaises(Exception) as context:
+            readData('testData/data7.xlsx', 'A-B', 'C-D', nWorkers=0)
+        self.assertTrue("The number of workers has to be a positive integer" in str(context.exception))
+
     def testAppend(self):
         dat1 = readData('testData/data1.xlsx', 'A-B')
         dat2 = readData('testData/data2.xlsx', 'A-B')
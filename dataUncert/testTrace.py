@@ -0,0 +1,154 @@
+import logging
+logging.disable(logging.CRITICAL)
+import unittest
+import numpy as np
+from dataUncert import variable, trace
+
+
+class test(unittest.TestCase):
+
+    def testHeatBalance(self):
+        c = variable(4.182, 'J/kg-K', 130)
+        rho = variable(1000, 'kg/m3', 0.01)
+        v_dot = variable(300, 'L/min', 3)
+        t_in = variable(50, 'C', 1.2)
+        t_out = variable([10, 15, 20, 25, 30, 35, 40], 'C', [0.9, 1.1, 1.0, 0.8, 0.9, 1.3, 1.1])
+
+        def func(rho, v_dot, t_in, t_out):
+            q = c * rho * v_dot * (t_in - t_out)
+            q.convert('kW')
+            return q
+
+        expression = trace(func, rho, v_dot, t_in, t_out)
+        self.assertEqual(expression.unit, 'kW')
+
+        q = func(rho, v_dot, t_in, t_out)
+        value, uncert = expression([rho.value, v_dot.value, t_in.value, t_out.value], [rho.uncert, v_dot.uncert, t_in.uncert, t_out.uncert])
+        np.testing.assert_array_almost_equal(value, q.value)
+        np.testing.assert_array_almost_equal(uncert, q.uncert)
+
+        # the expression is evaluated with new measurements
+        t_in = variable([60, 62], 'C', [1.3, 1.4])
+        t_out = variable([12, 14], 'C', [0.7, 0.6])
+        v_dot = variable([250, 260], 'L/min', [2.5, 2.6])
+        q = func(rho, v_dot, t_in, t_out)
+        value, uncert = expression([rho.value, v_dot.value, t_in.value, t_out.value], [rho.uncert, v_dot.uncert, t_in.uncert, t_out.uncert])
+        np.testing.assert_array_almost_equal(value, q.value)
+        np.testing.assert_array_almost_equal(uncert, q.uncert)
+
+        # the uncertanty of the inputs is zero if it is not supplied
+        value, uncert = expression([rho.value, v_dot.value, t_in.value, t_out.value])
+        np.testing.assert_array_almost_equal(value, q.value)
+        np.testing.assert_array_almost_equal(uncert, 130 / 4.182 * q.value)
+
+    def testFunctions(self):
+        a = variable([0.3, 0.4], '', [0.01, 0.02])
+        b = variable([0.7, 0.9], '', [0.02, 0.01])
+        angle = variable([30, 40], '°', [1, 2])
+
+        def func(a, b, angle):
+            out = np.sqrt(a**2 + b) * np.sin(b * a * variable(1, 'rad')) - 2 / a + np.log10(a) - (1 - b)
+            out += np.cos(angle) + np.tan(angle) * 2 + np.sin(angle) + np.log(b / a)
+            return out
+
+        expression = trace(func, a, b, angle)
+        out = func(a, b, angle)
+        value, uncert = expression([a.value, b.value, angle.value], [a.uncert, b.uncert, angle.uncert])
+        np.testing.assert_array_almost_equal(value, out.value)
+        np.testing.assert_array_almost_equal(uncert, out.uncert)
+
+        a = variable(0.3, '', 0.01)
+        b = variable(0.7, '', 0.02)
+        expression = trace(lambda a, b: np.exp(a) * b**a, a, b)
+        out = np.exp(a) * b**a
+        value, uncert = expression([a.value, b.value], [a.uncert, b.uncert])
+        np.testing.assert_array_almost_equal(value, out.value)
+        np.testing.assert_array_almost_equal(uncert, out.uncert)
+
+    def testTemperature(self):
+        a = variable([20, 30], 'C', [1, 2])
+        b = variable([5, 6], 'DELTAC', [0.1, 0.2])
+        c = variable([300, 310], 'K', [0.3, 0.4])
+
+        def func(a, b, c):
+            d = a + b
+            d.convert('F')
+            return d - c + 3 * a
+
+        expression = trace(func, a, b, c)
+        out = func(a, b, c)
+        self.assertEqual(expression.unit, out.unit)
+        value, uncert = expression([a.value, b.value, c.value], [a.uncert, b.uncert, c.uncert])
+        np.testing.assert_array_almost_equal(value, out.value)
+        np.testing.assert_array_almost_equal(uncert, out.uncert)
+
+    def testAbsAndLog10(self):
+        a = variable([-0.3, 0, 0.4], '', [0.01, 0.02, 0.03])
+        b = variable([0.7, 0.9, 1.1], '', [0.02, 0.01, 0.03])
+
+        def func(a, b):
+            return np.abs(a) * np.log10(b) + a
+
+        expression = trace(func, a, b)
+        out = func(a, b)
+        value, uncert = expression([a.value, b.value], [a.uncert, b.uncert])
+        np.testing.assert_array_almost_equal(value, out.value)
+        np.testing.assert_array_almost_equal(uncert, out.uncert)
+        np.testing.assert_array_almost_equal(np.log10(b).uncert, b.uncert / (b.value * np.log(10)))
+
+    def testCorrelatedVariables(self):
+        a = variable([1, 2], 'm', [0.1, 0.2])
+        b = variable([3, 4], 'm', [0.3, 0.4])
+        c = a + b
+
+        # the inputs depend on the same measurement
+        with self.assertRaises(Exception) as context:
+            trace(lambda a, c: a * c, a, c)
+        self.assertTrue('The inputs and the variables used in the function can not be correlated' in str(context.exception))
+
+        # a variable used in the function depends on an input
+        with self.assertRaises(Exception) as context:
+            trace(lambda b: b * c, b)
+        self.assertTrue('The inputs and the variables used in the function can not be correlated' in str(context.exception))
+
+        # the inputs have a covariance
+        d = variable([5, 6], 'm', [0.5, 0.6])
+        a._addCovariance(d, [0.01, 0.02])
+        d._addCovariance(a, [0.01, 0.02])
+        with self.assertRaises(Exception) as context:
+            trace(lambda a, d: a + d, a, d)
+        self.assertTrue('The inputs and the variables used in the function can not be correlated' in str(context.exception))
+
+        # independent variables can be used
+        e = variable([7, 8], 'm2', [0.7, 0.8])
+        expression = trace(lambda b, d: b * d + e, b, d)
+        self.assertEqual(expression.unit, 'm2')
+
+    def testErrors(self):
+        a = variable([1, 2], 'm', [0.1, 0.2])
+        b = variable([3, 4], 's', [0.3, 0.4])
+
+        with self.assertRaises(Exception) as context:
+            trace(lambda a, b: a + b, a, b)
+        self.assertTrue('You tried to add a variable in [m] to a variable in [s], but the units do not have the same SI base unit' in str(context.exception))
+
+        with self.assertRaises(Exception) as context:
+            trace(lambda a, b: np.mean(a / b), a, b)
+        self.assertTrue('The function mean can not be used in a traced function' in str(context.exception))
+
+        with self.assertRaises(Exception) as context:
+            trace(lambda a, b: a[0], a, b)
+        self.assertTrue('You can not index a variable in a traced function' in str(context.exception))
+
+        with self.assertRaises(Exception) as context:
+            trace(lambda a, b: variable(1, 'm'), a, b)
+        self.assertTrue('The function has to return a variable, which depends on the inputs' in str(context.exception))
+
+        expression = trace(lambda a, b: a / b, a, b)
+        with self.assertRaises(Exception) as context:
+            expression([a.value])
+        self.assertTrue('The expression has 2 inputs, but 1 values were supplied' in str(context.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
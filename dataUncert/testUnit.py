@@ -1,7 +1,9 @@
 import logging
 logging.disable(logging.CRITICAL)
 import unittest
-from dataUncert.unit import unit
+import sys
+import threading
+from dataUncert.unit import unit, _unitCache
 
 
 class test(unittest.TestCase):
@@ -150,6 +152,123 @@ class test(unittest.TestCase):
             a = unit('m/s/bar')
         self.assertEqual('A unit can only have a single slash (/)', str(context.exception))
 
+    def testCache(self):
+        a = unit('kg / m3')
+        info = unit.cacheInfo()['units']
+        b = unit('kg/m3')
+        self.assertEqual(unit.cacheInfo()['units']['hits'], info['hits'] + 1)
+        self.assertEqual(str(b), 'kg/m3')
+        self.assertEqual(b._SIBaseUnit, a._SIBaseUnit)
+
+        # the lists of a cached unit can not be modified through another unit
+        b.upperExp[0] = 2
+        c = unit('kg/m3')
+        self.assertEqual(c.upperExp, [1])
+
+        with self.assertRaises(Exception) as context:
+            unit('m!/s')
+        self.assertEqual('The character ! is not used within the unitsystem', str(context.exception))
+
+    def testAlgebraCache(self):
+        a = unit('L/min')
+        b = unit('kg-m/L')
+        c = a * b
+        info = unit.cacheInfo()['algebra']
+        self.assertEqual(a * b, c)
+        self.assertEqual(unit.cacheInfo()['algebra']['hits'], info['hits'] + 1)
+
+        # the operator is part of the key
+        self.assertTrue(unit('L2/min-kg-m')._assertEqual(unit(a / b)))
+        self.assertEqual(str(a**2), 'L2/min2')
+        self.assertEqual(str(a**2), 'L2/min2')
+
+        # errors are raised every time
+        for _ in range(2):
+            with self.assertRaises(Exception) as context:
+                a**1.5
+            self.assertEqual('The power has to be an integer', str(context.exception))
+
+    def testConverterCache(self):
+        a = unit('L/min')
+        converter = a.getConverter('m3/h')
+        info = unit.cacheInfo()['converters']
+        self.assertIs(unit('L/min').getConverter('m3 / h'), converter)
+        self.assertEqual(unit.cacheInfo()['converters']['hits'], info['hits'] + 1)
+        self.assertAlmostEqual(converter.convert(1), 0.06)
+
+        for _ in range(2):
+            with self.assertRaises(Exception) as context:
+                a.getConverter('m')
+            self.assertEqual('You tried to convert from L/min to m. But these do not have the same base units', str(context.exception))
+
+    def testCacheThreads(self):
+        # the threads are switched often, such that the threads use the cache at the same time
+        cache = _unitCache(maxSize=8)
+        nThreads, nIterations = 8, 2000
+        errors = []
+
+        def work(k):
+            try:
+                for i in range(nIterations):
+                    key = (k + i) % 16
+                    if cache.get(key) is None:
+                        cache.add(key, key)
+            except Exception as e:
+                errors.append(e)
+
+        switchInterval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=work, args=(k,)) for k in range(nThreads)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switchInterval)
+
+        self.assertEqual(errors, [])
+        info = cache.info()
+        self.assertEqual(info['hits'] + info['misses'], nThreads * nIterations)
+        self.assertLessEqual(info['size'], 8)
+
+        # the units are parsed and converted from multiple threads
+        def convert(k):
+            try:
+                for i in range(200):
+                    a = unit(['L/min', 'm3/h', 'kg/m3', 'mA', 'kW'][(k + i) % 5])
+                    a.getConverter(a._SIBaseUnit)
+                    a * a
+            except Exception as e:
+                errors.append(e)
+        threads = [threading.Thread(target=convert, args=(k,)) for k in range(nThreads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def testDimension(self):
+        a = unit('kJ/kg-C')
+        b = unit('J/kg-K')
+        self.assertEqual(a._dimension, b._dimension)
+        self.assertEqual(a._SIBaseUnit, 'm2/DELTAK-s2')
+
+        a = unit('L/min')
+        b = unit('m3/h')
+        self.assertEqual(a._dimension, b._dimension)
+        self.assertNotEqual(a._dimension, unit('m3')._dimension)
+        self.assertEqual(a._SIBaseUnit, 'm3/s')
+
+        # the product of two units has the sum of the dimensions
+        c = unit(a * unit('kg-m/L'))
+        self.assertEqual(c._dimension, tuple(x + y for x, y in zip(a._dimension, unit('kg-m/L')._dimension)))
+
+        self.assertEqual(unit('%')._SIBaseUnit, '1')
+        self.assertEqual(unit('m/m')._SIBaseUnit, '1')
+        self.assertEqual(unit('1/N')._SIBaseUnit, 's2/kg-m')
+        self.assertEqual(unit('V')._SIBaseUnit, 'kg-m2/A-s3')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,9 +1,12 @@
 import logging
 logging.disable(logging.CRITICAL)
 import unittest
+from unittest import mock
 import numpy as np
 from random import uniform
-from dataUncert.variable import variable
+from dataUncert.variable import variable, setLazyUncertanty, setPrintOptions
+import importlib
+variableModule = importlib.import_module('dataUncert.variable')
 
 
 class test(unittest.TestCase): 
@@ -295,6 +298,24 @@ class test(unittest.TestCase):
         C = A - B
         C_vec = A_vec - B_vec
 
+    def test_add_sub_does_not_convert(self):
+        A = variable([12.3, 54.3], 'L/min', uncert=[2.6, 5.4])
+        B = variable([745.1, 496.13], 'm3/h', uncert=[53.9, 24.75])
+        value, uncert, unitObject = A._value, A._uncert, A._unitObject
+
+        # the operands are not converted to the SI unit system and back
+        C = A + B
+        D = A - B
+        self.assertIs(A._value, value)
+        self.assertIs(A._uncert, uncert)
+        self.assertIs(A._unitObject, unitObject)
+        self.assertEqual(A.unit, 'L/min')
+        self.assertEqual(B.unit, 'm3/h')
+        np.testing.assert_array_almost_equal(C.value, np.array([12.3, 54.3]) / 60000 + np.array([745.1, 496.13]) / 3600)
+        np.testing.assert_array_almost_equal(D.value, np.array([12.3, 54.3]) / 60000 - np.array([745.1, 496.13]) / 3600)
+        np.testing.assert_array_almost_equal(C.uncert, np.sqrt((np.array([2.6, 5.4]) / 60000)**2 + (np.array([53.9, 24.75]) / 3600)**2))
+        np.testing.assert_array_almost_equal(D.uncert, C.uncert)
+
     def test_pow(self):
         A = variable(12.3, 'L/min', uncert=2.6)
         B = variable(745.1, 'm', uncert=53.9)
@@ -364,6 +385,26 @@ class test(unittest.TestCase):
             2.54**D_vec
         self.assertTrue('The exponent has to be a single number' in str(context.exception))
 
+        H_vec = C_vec**0.5
+        np.testing.assert_array_almost_equal(H_vec.value, np.array([745.1, 496.13, 120.54])**0.5)
+        self.assertEqual(H_vec.unit, '1')
+        np.testing.assert_array_almost_equal(H_vec.uncert, 0.5 * np.array([745.1, 496.13, 120.54])**(-0.5) * np.array([53.9, 24.75, 6.4]))
+
+        I_vec = C_vec**-1
+        np.testing.assert_array_almost_equal(I_vec.value, 1 / np.array([745.1, 496.13, 120.54]))
+        self.assertEqual(I_vec.unit, '1')
+        np.testing.assert_array_almost_equal(I_vec.uncert, np.array([745.1, 496.13, 120.54])**(-2) * np.array([53.9, 24.75, 6.4]))
+
+        J_vec = C_vec**D
+        np.testing.assert_array_almost_equal(J_vec.value, np.array([745.1, 496.13, 120.54])**0.34)
+        self.assertEqual(J_vec.unit, '1')
+        np.testing.assert_array_almost_equal(
+            J_vec.uncert,
+            np.sqrt(
+                (0.34 * np.array([745.1, 496.13, 120.54])**(0.34 - 1) * np.array([53.9, 24.75, 6.4]))**2
+                + (np.array([745.1, 496.13, 120.54])**0.34 * np.log(np.array([745.1, 496.13, 120.54])) * 0.01)**2
+            ))
+
     def test_log(self):
         A = variable(12.3, 'L/min', uncert=2.6)
         C = variable(745.1, '1', uncert=53.9)
@@ -406,17 +447,17 @@ class test(unittest.TestCase):
         E = np.log10(C)
         self.assertAlmostEqual(E.value, np.log10(745.1))
         self.assertEqual(E.unit, '1')
-        self.assertAlmostEqual(E.uncert, np.sqrt((1 / (745.1 * np.log10(745.1))) * 53.9)**2)
+        self.assertAlmostEqual(E.uncert, np.sqrt(((1 / (745.1 * np.log(10))) * 53.9)**2))
 
         E_vec = np.log10(C_vec)
         np.testing.assert_array_equal(E_vec.value, np.array([np.log10(745.1), np.log10(496.13), np.log10(120.54)]))
         self.assertEqual(E_vec.unit, '1')
-        np.testing.assert_array_equal(
+        np.testing.assert_array_almost_equal(
             E_vec.uncert,
             np.array([
-                np.sqrt(((1 / (745.1 * np.log10(745.1))) * 53.9)**2),
-                np.sqrt(((1 / (496.13 * np.log10(496.13))) * 24.75)**2),
-                np.sqrt(((1 / (120.54 * np.log10(120.54))) * 6.4)**2)
+                np.sqrt(((1 / (745.1 * np.log(10))) * 53.9)**2),
+                np.sqrt(((1 / (496.13 * np.log(10))) * 24.75)**2),
+                np.sqrt(((1 / (120.54 * np.log(10))) * 6.4)**2)
             ]))
 
     def test_exp(self):
@@ -431,16 +472,60 @@ class test(unittest.TestCase):
 
         with self.assertRaises(Exception) as context:
             np.exp(A_vec)
-        self.assertTrue('The exponent has to be a single number' in str(context.exception))
+        self.assertTrue('The exponent can not have a unit' in str(context.exception))
 
         D = np.exp(C)
         self.assertAlmostEqual(D.value, np.e**12.3)
         self.assertEqual(D.unit, '1')
         self.assertAlmostEqual(D.uncert, np.sqrt((np.e**12.3 * np.log(np.e) * 5.39)**2))
 
-        with self.assertRaises(Exception) as context:
-            np.exp(C_vec)
-        self.assertTrue('The exponent has to be a single number' in str(context.exception))
+        # np.exp is evaluated for each element of a variable
+        D_vec = np.exp(C_vec)
+        np.testing.assert_allclose(D_vec.value, np.exp([12.3, 54.3, 91.3]))
+        self.assertEqual(D_vec.unit, '1')
+        np.testing.assert_allclose(D_vec.uncert, np.exp([12.3, 54.3, 91.3]) * [2.6, 5.4, 10.56])
+
+    def test_ufunc(self):
+        A_vec = variable([12.3, 54.3, 91.3], 'L/min', uncert=[2.6, 5.4, 10.56])
+        B = np.array([1.5, 2.5, 3.5])
+
+        # numpy arrays are converted to variables by the operators of the variable
+        C_vec = B * A_vec
+        self.assertIsInstance(C_vec, variable)
+        np.testing.assert_array_almost_equal(C_vec.value, B * A_vec.value)
+        np.testing.assert_array_almost_equal(C_vec.uncert, B * A_vec.uncert)
+        self.assertEqual(C_vec.unit, 'L/min')
+
+        C_vec = B - A_vec
+        np.testing.assert_array_almost_equal(C_vec.value, B - A_vec.value)
+        self.assertEqual(C_vec.unit, 'L/min')
+
+        C_vec = np.divide(B, A_vec)
+        np.testing.assert_array_almost_equal(C_vec.value, B / A_vec.value)
+        np.testing.assert_array_almost_equal(C_vec.uncert, B / A_vec.value**2 * A_vec.uncert)
+        self.assertEqual(C_vec.unit, 'min/L')
+
+        C_vec = np.float64(2) * A_vec
+        self.assertIsInstance(C_vec, variable)
+        np.testing.assert_array_almost_equal(C_vec.value, 2 * A_vec.value)
+
+        np.testing.assert_array_equal(np.array([20, 20, 20]) < A_vec, [False, True, True])
+        np.testing.assert_array_equal(np.greater(A_vec, 20), [False, True, True])
+
+        C_vec = np.sqrt(A_vec * A_vec)
+        np.testing.assert_array_almost_equal(C_vec.value, A_vec.value)
+        np.testing.assert_array_almost_equal(C_vec.uncert, A_vec.uncert)
+        self.assertEqual(C_vec.unit, 'L/min')
+
+        C_vec = np.negative(A_vec)
+        np.testing.assert_array_almost_equal(C_vec.value, -A_vec.value)
+        C_vec = np.absolute(C_vec)
+        np.testing.assert_array_almost_equal(C_vec.value, A_vec.value)
+        np.testing.assert_array_almost_equal(C_vec.uncert, A_vec.uncert)
+        np.testing.assert_array_almost_equal((np.absolute(np.negative(A_vec)) - A_vec).uncert, [0, 0, 0])
+
+        with self.assertRaises(Exception):
+            np.maximum(A_vec, A_vec)
 
     def testIndex(self):
         A = variable(12.3, 'L/min', uncert=2.6)
@@ -474,6 +559,61 @@ class test(unittest.TestCase):
             a = A[23]
         self.assertTrue('Index out of bounds' in str(context.exception))
 
+        a_vec = A_vec[1:]
+        np.testing.assert_equal(a_vec.value, [54.3, 91.3])
+        np.testing.assert_equal(a_vec.uncert, [5.4, 10.56])
+
+        a_vec = A_vec[np.array([True, False, True])]
+        np.testing.assert_equal(a_vec.value, [12.3, 91.3])
+        np.testing.assert_equal(a_vec.uncert, [2.6, 10.56])
+
+        a_vec = A_vec[A_vec > variable(50, 'L/min')]
+        np.testing.assert_equal(a_vec.value, [54.3, 91.3])
+
+        a_vec = A_vec[np.array([2, 2, 0])]
+        np.testing.assert_equal(a_vec.value, [91.3, 91.3, 12.3])
+        np.testing.assert_equal(a_vec.uncert, [10.56, 10.56, 2.6])
+
+        with self.assertRaises(Exception) as context:
+            a = A_vec[np.array([True, False])]
+        self.assertTrue('Index out of bounds' in str(context.exception))
+
+        # the indexed variables depends on the datapoints of the variable
+        a_vec = A_vec[0:2] - A_vec[0:2]
+        np.testing.assert_equal(a_vec.uncert, [0, 0])
+
+        a_vec = A_vec[0:2] + A_vec[1:3]
+        np.testing.assert_array_almost_equal(a_vec.uncert, [np.sqrt(2.6**2 + 5.4**2), np.sqrt(5.4**2 + 10.56**2)])
+
+        a_vec = A_vec[[0, 0]] + A_vec[0:2]
+        np.testing.assert_array_almost_equal(a_vec.uncert, [2 * 2.6, np.sqrt(2.6**2 + 5.4**2)])
+
+        a_vec = A_vec[0] + A_vec[1] + A_vec[2]
+        self.assertAlmostEqual(a_vec.uncert, np.sqrt(2.6**2 + 5.4**2 + 10.56**2))
+
+        # rows of the indexed variable, which depend on the same datapoint of a variable, are combined
+        a = variable([1.0, 2.0, 3.0], 'm', uncert=[0.1, 0.2, 0.3])
+        self.assertAlmostEqual((a - a[0])[0].uncert, 0)
+        self.assertAlmostEqual(((a - a[0])[0] * 2).uncert, 0)
+        self.assertAlmostEqual(((a + a[::-1])[1] * 1).uncert, 2 * 0.2)
+        self.assertAlmostEqual(((a - a[0])[0] + (a - a[0])[1]).uncert, np.sqrt(0.1**2 + 0.2**2))
+        np.testing.assert_array_almost_equal(((a + a[::-1])[[1, 0]] * 1).uncert, [2 * 0.2, np.sqrt(0.1**2 + 0.3**2)])
+        np.testing.assert_array_almost_equal(((a - a[0])[0:2] - a[1]).uncert, [0.2, 0.1])
+
+        B_vec = variable([1.2, 3.4, 5.6], 'min', uncert=[0.1, 0.2, 0.3])
+        C_vec = A_vec * B_vec
+        c_vec = C_vec[1:]
+        np.testing.assert_array_almost_equal(c_vec.uncert, C_vec.uncert[1:])
+        np.testing.assert_array_almost_equal((c_vec - A_vec[1:] * B_vec[1:]).uncert, [0, 0])
+
+        # the covariance of the datapoints is used
+        A_vec._addCovariance(B_vec, [0.1, 0.2, 0.3])
+        B_vec._addCovariance(A_vec, [0.1, 0.2, 0.3])
+        np.testing.assert_array_almost_equal((A_vec[1:] * B_vec[1:]).uncert, (A_vec * B_vec).uncert[1:])
+        np.testing.assert_array_almost_equal(
+            (A_vec[1:] * B_vec[0:2]).uncert,
+            np.sqrt((B_vec.value[0:2] * A_vec.uncert[1:])**2 + (A_vec.value[1:] * B_vec.uncert[0:2])**2))
+
     def testAddEqual(self):
         A = variable(12.3, 'L/min', uncert=2.6)
         B = variable(745.1, 'L/min', uncert=53.9)
@@ -744,6 +884,71 @@ class test(unittest.TestCase):
                 np.sqrt((1 / 12.3 * 10.56)**2 + (91.3 / (12.3**2) * 2.6)**2),
             ]))
 
+    def testInPlace(self):
+        A_vec = variable([12.3, 54.3, 91.3], 'L/min', uncert=[2.6, 5.4, 10.56])
+        B_vec = variable([745.1, 496.13, 120.54], 'L/min', uncert=[53.9, 24.75, 6.4])
+        C = variable(0.5, 'L/s', uncert=0.01)
+        D_vec = variable([1.2, 3.4, 5.6], 'm', uncert=[0.1, 0.2, 0.3])
+
+        # a measurement is not changed, as other variables might depend on it
+        A = A_vec
+        A += B_vec
+        self.assertFalse(A is A_vec)
+        np.testing.assert_array_equal(A_vec.value, [12.3, 54.3, 91.3])
+
+        # the unit of the measurement is kept as if it was updated in place
+        for isMeasurement in [True, False]:
+            S = A_vec if isMeasurement else A_vec * 1
+            S += C
+            self.assertEqual(S.unit, 'L/min')
+            np.testing.assert_array_almost_equal(S.value, A_vec.value + 30)
+            np.testing.assert_array_almost_equal(S.uncert, np.sqrt(A_vec.uncert**2 + 0.6**2))
+
+            S = A_vec if isMeasurement else A_vec * 1
+            S -= C
+            self.assertEqual(S.unit, 'L/min')
+            np.testing.assert_array_almost_equal(S.value, A_vec.value - 30)
+            np.testing.assert_array_almost_equal(S.uncert, np.sqrt(A_vec.uncert**2 + 0.6**2))
+
+        # a variable which depends on other variables is updated in place
+        E = A_vec * 2
+        F = E[0:2]
+        G = E
+        E += C
+        self.assertTrue(E is G)
+        self.assertEqual(E.unit, 'L/min')
+        H = A_vec * 2 + C
+        H.convert('L/min')
+        np.testing.assert_array_almost_equal(E.value, H.value)
+        np.testing.assert_array_almost_equal(E.uncert, H.uncert)
+        np.testing.assert_array_equal(F.value, [2 * 12.3, 2 * 54.3])
+
+        E -= B_vec
+        H = H - B_vec
+        np.testing.assert_array_almost_equal(E.value, H.value)
+        np.testing.assert_array_almost_equal(E.uncert, H.uncert)
+
+        E *= D_vec
+        H = H * D_vec
+        self.assertTrue(E is G)
+        self.assertEqual(E.unit, H.unit)
+        np.testing.assert_array_almost_equal(E.value, H.value)
+        np.testing.assert_array_almost_equal(E.uncert, H.uncert)
+
+        E /= A_vec
+        H = H / A_vec
+        self.assertEqual(E.unit, 'm')
+        np.testing.assert_array_almost_equal(E.value, H.value)
+        np.testing.assert_array_almost_equal(E.uncert, H.uncert)
+
+        # running sum
+        measurements = [variable([1, 2, 3], 'm', uncert=[0.1, 0.2, 0.3]) for _ in range(10)]
+        acc = variable(0, 'm')
+        for x in measurements:
+            acc += x
+        np.testing.assert_array_almost_equal(acc.value, [10, 20, 30])
+        np.testing.assert_array_almost_equal(acc.uncert, np.sqrt(10) * np.array([0.1, 0.2, 0.3]))
+
     def testPrintValueAndUncertScalar(self):
         A = variable(123456789 * 10**(0), 'm', uncert=123456789 * 10**(-2), nDigits=3)
         self.assertEqual(str(A), '123000000 +/- 1000000 [m]')
@@ -947,6 +1152,48 @@ class test(unittest.TestCase):
         self.assertEqual(c.__str__(pretty=True), '[12.3, 56.2]\\ \\left [m\\right ]')
         self.assertEqual(d.__str__(pretty=True), '[12, 56] \pm [2, 7]\\ \\left [m\\right ]')
 
+    def testPrintSummary(self):
+        a = variable(np.arange(1, 2001), 'm', np.full(2000, 0.1))
+        b = variable(np.arange(1, 2001), 'm')
+
+        self.assertEqual(str(a), '[1.0, 2.0, 3.0, ..., 1998.0, 1999.0, 2000.0] +/- [0.1, 0.1, 0.1, ..., 0.1, 0.1, 0.1] [m]')
+        self.assertEqual(str(b), '[1, 2, 3, ..., 2e+03, 2e+03, 2e+03] [m]')
+        self.assertEqual(str(a[0:3]), '[1.0, 2.0, 3.0] +/- [0.1, 0.1, 0.1] [m]')
+
+        setPrintOptions(threshold=5, edgeitems=1)
+        self.assertEqual(str(a[0:6]), '[1.0, ..., 6.0] +/- [0.1, ..., 0.1] [m]')
+        self.assertEqual(str(a[0:5]), '[1.0, 2.0, 3.0, 4.0, 5.0] +/- [0.1, 0.1, 0.1, 0.1, 0.1] [m]')
+
+        setPrintOptions(threshold=None)
+        self.assertEqual(str(a).count(','), 2 * 1999)
+        setPrintOptions()
+
+    def testRounded(self):
+        value, uncert, decimals = variable(12.34, 'm', 0.016).getRounded()
+        self.assertAlmostEqual(value, 12.34)
+        self.assertAlmostEqual(uncert, 0.02)
+        self.assertEqual(decimals, 2)
+
+        value, uncert, decimals = variable(1234, 'm', 16).getRounded()
+        self.assertEqual(value, 1230)
+        self.assertEqual(uncert, 20)
+        self.assertEqual(decimals, -1)
+
+        value, uncert, decimals = variable(12.345, 'm').getRounded()
+        self.assertAlmostEqual(value, 12.3)
+        self.assertEqual(uncert, 0)
+        self.assertEqual(decimals, 1)
+
+        a = variable([12.3, 1234, 1.234, 12.345], 'm', [0.01, 16, 16, 0])
+        value, uncert, decimals = a.getRounded()
+        np.testing.assert_array_almost_equal(value, [12.3, 1230, 0, 12.3])
+        np.testing.assert_array_almost_equal(uncert, [0.01, 20, 20, 0])
+        np.testing.assert_array_equal(decimals, [2, -1, -1, 1])
+
+        # the rounded values are the printed values
+        for elem, v, u in zip(a, value, uncert):
+            self.assertTrue(str(elem).startswith(f'{v:.{max(0, elem.getRounded()[2])}f}'))
+
     def testMax(self):
 
         A = variable(10, 'm', 2.3)
@@ -1033,6 +1280,76 @@ class test(unittest.TestCase):
         self.assertEqual(C.unit, 'm')
         self.assertEqual(C.uncert, np.sqrt(2.3**2 + 1.7**2))
 
+    def testReductions(self):
+        a = variable([1.2, 2.3, 3.1, 4.5], 'm', [0.1, 0.2, 0.3, 0.4])
+        c = variable(2.5, '1', 0.2)
+        n = 4
+
+        b = np.sum(a)
+        self.assertAlmostEqual(b.value, 1.2 + 2.3 + 3.1 + 4.5)
+        self.assertEqual(b.unit, 'm')
+        self.assertAlmostEqual(b.uncert, np.sqrt(np.sum(a.uncert**2)))
+
+        # the reduction depends on the datapoints of the variable
+        b = np.sum(a) - np.sum(a)
+        self.assertAlmostEqual(b.uncert, 0)
+        b = np.sum(a) - a[0] - a[1] - a[2] - a[3]
+        self.assertAlmostEqual(b.uncert, 0)
+
+        b = np.mean(c * a)
+        self.assertAlmostEqual(b.value, 2.5 * np.mean(a.value))
+        self.assertAlmostEqual(b.uncert, np.sqrt((np.mean(a.value) * 0.2)**2 + np.sum((2.5 / n * a.uncert)**2)))
+
+        weights = np.array([1, 2, 3, 4])
+        b = np.average(a, weights=weights)
+        self.assertAlmostEqual(b.value, np.average(a.value, weights=weights))
+        self.assertAlmostEqual(b.uncert, np.sqrt(np.sum((weights / np.sum(weights) * a.uncert)**2)))
+
+        b = np.std(a)
+        self.assertAlmostEqual(b.value, np.std(a.value))
+        self.assertAlmostEqual(b.uncert, np.sqrt(np.sum(((a.value - np.mean(a.value)) / (n * np.std(a.value)) * a.uncert)**2)))
+        b = np.std(a, ddof=1)
+        self.assertAlmostEqual(b.value, np.std(a.value, ddof=1))
+
+        b = np.cumsum(c * a)
+        np.testing.assert_array_almost_equal(b.value, np.cumsum(2.5 * a.value))
+        np.testing.assert_array_almost_equal(b.uncert, np.sqrt((np.cumsum(a.value) * 0.2)**2 + np.cumsum((2.5 * a.uncert)**2)))
+
+        # the cumulative sum depends on the datapoints of the variable
+        b = np.diff(np.cumsum(a))
+        np.testing.assert_array_almost_equal(b.value, a.value[1:])
+        np.testing.assert_array_almost_equal(b.uncert, a.uncert[1:])
+        b = np.cumsum(a) - a
+        np.testing.assert_array_almost_equal(b.uncert, np.sqrt(np.append(0, np.cumsum(a.uncert[:-1]**2))))
+        b = np.cumsum(c * a) - c * np.cumsum(a)
+        np.testing.assert_array_almost_equal(b.uncert, [0, 0, 0, 0])
+
+        # a large cumulative sum is not correlated with the variable
+        limit = variableModule._maxCumulativeSensitivities
+        variableModule._maxCumulativeSensitivities = 5
+        try:
+            b = np.cumsum(a)
+            np.testing.assert_array_almost_equal(b.uncert, np.sqrt(np.cumsum(a.uncert**2)))
+            self.assertEqual(b._sparseGrad, {})
+        finally:
+            variableModule._maxCumulativeSensitivities = limit
+
+        b = np.diff(a)
+        np.testing.assert_array_almost_equal(b.value, np.diff(a.value))
+        np.testing.assert_array_almost_equal(b.uncert, np.sqrt(a.uncert[1:]**2 + a.uncert[:-1]**2))
+        np.testing.assert_array_almost_equal((b + a[:-1] - a[1:]).uncert, [0, 0, 0])
+        np.testing.assert_array_almost_equal(np.diff(a, 2).value, np.diff(a.value, 2))
+
+        # the covariance of the datapoints is used
+        d = variable([4.1, 3.2, 2.7, 1.3], 'm', [0.3, 0.2, 0.1, 0.2])
+        covariance = np.array([0.01, 0.02, 0.005, 0.01])
+        a._addCovariance(d, covariance)
+        d._addCovariance(a, covariance)
+        b = np.sum(a * d)
+        self.assertAlmostEqual(b.uncert, np.sqrt(np.sum((d.value * a.uncert)**2 + (a.value * d.uncert)**2 + 2 * a.value * d.value * covariance)))
+        b = np.cumsum(a + d)
+        np.testing.assert_array_almost_equal(b.uncert, np.sqrt(np.cumsum(a.uncert**2 + d.uncert**2 + 2 * covariance)))
+
     def testTrig(self):
         a = variable(75, '°', 1)
         b = np.sin(a)
@@ -1185,6 +1502,28 @@ class test(unittest.TestCase):
         self.assertEqual(b.unit, 'L/min')
         self.assertAlmostEqual(b.uncert, np.sqrt((np.e * 0.0237)**2))
 
+    def testSensitivities(self):
+        a = variable([1.2, 3.4, 5.6], 'm', [0.1, 0.2, 0.3])
+        b = variable(2.5, 'm', 0.4)
+        c = variable([7.8, 9.1, 2.3], 'm', [0.5, 0.6, 0.7])
+
+        # the sensitivities are stored with a row for each leaf and a coloumn for each datapoint
+        d = (a * b + c * b) * a
+        self.assertEqual(d._grad.shape, (3, 3))
+        self.assertListEqual(d._leaves, [a, b, c])
+        np.testing.assert_array_almost_equal(d.dependsOn[a], 2 * a.value * b.value + c.value * b.value)
+        np.testing.assert_array_almost_equal(d.dependsOn[b], a.value**2 + c.value * a.value)
+        np.testing.assert_array_almost_equal(d.dependsOn[c], b.value * a.value)
+
+        dd_da = 2 * a.value * b.value + c.value * b.value
+        dd_db = a.value**2 + c.value * a.value
+        dd_dc = b.value * a.value
+        np.testing.assert_array_almost_equal(d.uncert, np.sqrt((dd_da * a.uncert)**2 + (dd_db * b.uncert)**2 + (dd_dc * c.uncert)**2))
+
+        # the sensitivities are stored in SI units
+        a.convert('mm')
+        np.testing.assert_array_almost_equal(d.dependsOn[a], dd_da)
+
     def testCovariance(self):
         a = variable(123, 'L/min', 9.7)
         b = variable(93, 'Pa', 1.2)
@@ -1205,6 +1544,91 @@ class test(unittest.TestCase):
         self.assertTrue(c._unitObject._assertEqual('m3-Pa/s'))
         self.assertEqual(c.uncert, np.sqrt((123 / 1000 / 60 * 1.2)**2 + (93 * 9.7 / 1000 / 60)**2 + 2 * 93 * 123 / 1000 / 60 * 23))
 
+    def testCovarianceArray(self):
+        a = variable([123, 97], 'L/min', [9.7, 8.1])
+        b = variable([93, 102], 'Pa', [1.2, 1.9])
+        c = variable([3.1, 4.2], 'm', [0.2, 0.3])
+        a._addCovariance(b, [23, 11])
+        b._addCovariance(a, [23, 11])
+        b._addCovariance(c, [0.1, 0.4])
+        c._addCovariance(b, [0.1, 0.4])
+        d = a * b * c
+
+        # the covariance is used for each datapoint
+        dd_da = b.value * c.value
+        dd_db = a.value * c.value
+        dd_dc = a.value * b.value
+        variance = (dd_da * a.uncert)**2 + (dd_db * b.uncert)**2 + (dd_dc * c.uncert)**2
+        variance += 2 * dd_da * dd_db * np.array([23, 11])
+        variance += 2 * dd_db * dd_dc * np.array([0.1, 0.4])
+        np.testing.assert_array_almost_equal(d.uncert, np.sqrt(variance))
+
+        # the covariance has to be noted in both variables
+        e = variable(1, 'm', 0.1)
+        f = variable(2, 'm', 0.2)
+        e._addCovariance(f, [0.01])
+        with self.assertRaises(Exception) as context:
+            e + f
+        self.assertTrue('Something is wrong' in str(context.exception))
+
+    def testLazyUncertanty(self):
+        a = variable([1.2, 3.4], 'L/min', [0.1, 0.2])
+        b = variable([5.6, 7.8], 'kg/L', [0.3, 0.4])
+        c = variable([20, 30], 'C', [1.1, 1.2])
+        d = variable([10, 15], 'C', [0.5, 0.6])
+        eager = a * b * (c - d)
+
+        setLazyUncertanty(True)
+        try:
+            e = a * b
+            self.assertTrue(e._uncertIsStale)
+            f = e * (c - d)
+            self.assertTrue(f._uncertIsStale)
+
+            # the uncertanty is calculated when it is needed and kept until the sensitivities change
+            np.testing.assert_array_almost_equal(f.uncert, eager.uncert)
+            self.assertFalse(f._uncertIsStale)
+            f *= 2
+            self.assertTrue(f._uncertIsStale)
+            np.testing.assert_array_almost_equal(f.uncert, 2 * eager.uncert)
+
+            # the uncertanty is kept stale when the variable is converted
+            g = a * b * (c - d)
+            g.convert('kg-K/s')
+            self.assertTrue(g._uncertIsStale)
+            eager.convert('kg-K/s')
+            np.testing.assert_array_almost_equal(g.uncert, eager.uncert)
+            self.assertEqual(str(g), str(eager))
+        finally:
+            setLazyUncertanty(False)
+
+        e = a * b
+        self.assertFalse(e._uncertIsStale)
+
+    def testLazyUncertantyIsNotEvaluated(self):
+        # the uncertanty is not evaluated by operations, which convert the result
+        a = [variable([1.2, 3.4], 'm', [0.1, 0.2]) for _ in range(10)]
+        b = variable([5.6, 7.8], 'km', [0.3, 0.4])
+        eager = sum(a[1:], a[0]) * b / (a[0] * b)
+
+        setLazyUncertanty(True)
+        try:
+            with mock.patch.object(variable, '_evaluateUncertanty', autospec=True, side_effect=variable._evaluateUncertanty) as evaluate:
+                c = a[0]
+                for elem in a[1:]:
+                    c = c + elem
+                self.assertEqual(c.unit, 'm')
+                d = c * b / (a[0] * b)
+                self.assertEqual(d.unit, '1')
+                self.assertEqual(evaluate.call_count, 0)
+                self.assertTrue(c._uncertIsStale)
+                self.assertTrue(d._uncertIsStale)
+
+                np.testing.assert_array_almost_equal(d.uncert, eager.uncert)
+                self.assertEqual(evaluate.call_count, 1)
+        finally:
+            setLazyUncertanty(False)
+
     def testConvert(self):
         a = variable(1, 'km')
         b = variable(1, 'm')
@@ -1214,21 +1638,21 @@ class test(unittest.TestCase):
     def testCompare(self):
         a = variable(1, 'm')
         b = variable([2, 3, 4], 'm')
-        self.assertListEqual(a < b, [True, True, True])
-        self.assertEqual(a <= b, [True, True, True])
-        self.assertEqual(a > b, [False, False, False])
-        self.assertEqual(a >= b, [False, False, False])
-        self.assertEqual(a == b, [False, False, False])
-        self.assertEqual(a != b, [True, True, True])
+        np.testing.assert_array_equal(a < b, [True, True, True])
+        np.testing.assert_array_equal(a <= b, [True, True, True])
+        np.testing.assert_array_equal(a > b, [False, False, False])
+        np.testing.assert_array_equal(a >= b, [False, False, False])
+        np.testing.assert_array_equal(a == b, [False, False, False])
+        np.testing.assert_array_equal(a != b, [True, True, True])
 
         a = variable([2, 3, 4], 'm')
         b = variable(1, 'm')
-        self.assertListEqual(a < b, [False, False, False])
-        self.assertEqual(a <= b, [False, False, False])
-        self.assertEqual(a > b, [True, True, True])
-        self.assertEqual(a >= b, [True, True, True])
-        self.assertEqual(a == b, [False, False, False])
-        self.assertEqual(a != b, [True, True, True])
+        np.testing.assert_array_equal(a < b, [False, False, False])
+        np.testing.assert_array_equal(a <= b, [False, False, False])
+        np.testing.assert_array_equal(a > b, [True, True, True])
+        np.testing.assert_array_equal(a >= b, [True, True, True])
+        np.testing.assert_array_equal(a == b, [False, False, False])
+        np.testing.assert_array_equal(a != b, [True, True, True])
 
         a = variable([1, 2], 'm')
         b = variable([2, 3, 4], 'm')
@@ -1284,13 +1708,28 @@ class test(unittest.TestCase):
 
         a = variable([1, 2, 3], 'm')
         b = variable([2, 3, 4], 'm')
-        self.assertListEqual(a < b, [True, True, True])
-        self.assertEqual(a <= b, [True, True, True])
-        self.assertEqual(a > b, [False, False, False])
-        self.assertEqual(a >= b, [False, False, False])
-        self.assertEqual(a == b, [False, False, False])
-        self.assertEqual(a != b, [True, True, True])
-        
+        np.testing.assert_array_equal(a < b, [True, True, True])
+        np.testing.assert_array_equal(a <= b, [True, True, True])
+        np.testing.assert_array_equal(a > b, [False, False, False])
+        np.testing.assert_array_equal(a >= b, [False, False, False])
+        np.testing.assert_array_equal(a == b, [False, False, False])
+        np.testing.assert_array_equal(a != b, [True, True, True])
+
+        # the comparisons return numpy arrays and the variables are not converted
+        a = variable([1, 2, 3], 'L/min')
+        b = variable([0.01, 0.02, 0.2], 'L/s')
+        c = a > b
+        self.assertIsInstance(c, np.ndarray)
+        self.assertEqual(c.dtype, bool)
+        np.testing.assert_array_equal(c, [True, True, False])
+        np.testing.assert_array_equal(a == b, [False, False, False])
+        self.assertEqual(a.unit, 'L/min')
+        self.assertEqual(b.unit, 'L/s')
+
+        a = variable(1, 'km')
+        b = variable(999, 'm')
+        self.assertTrue(a > b)
+        self.assertFalse(a < 0.5)
         
         a = variable(10,'L/min')
         b = variable(1, 'm3/h')
@@ -0,0 +1,344 @@
+import logging
+logger = logging.getLogger(__name__)
+import numpy as np
+from dataUncert.variable import variable
+from dataUncert.unit import unit
+
+
+def trace(func, *variables):
+    # the function is evaluated once using the variables. All operations are noted in an expression,
+    # which can be evaluated with new values and uncertanties without creating any variables or units
+    logger.info('Tracing the function %s', func)
+
+    graph = _graph(len(variables))
+    inputs = [_tracer(var._value, var.unit, var._uncert, graph, i) for i, var in enumerate(variables)]
+
+    out = func(*inputs)
+    if not isinstance(out, _tracer) or out._graph is not graph:
+        logger.error('The function has to return a variable, which depends on the inputs')
+        raise ValueError('The function has to return a variable, which depends on the inputs')
+
+    # the expression is evaluated with independent inputs and the variables, which are not inputs, are noted as independent measurements.
+    # Therefore none of these variables can be correlated
+    graph.assertIndependent(variables)
+
+    return expression(graph, graph.node(out), out.unit)
+
+
+class expression():
+    def __init__(self, graph, node, unitStr) -> None:
+        self._nInputs = graph.nInputs
+        self._steps = graph.steps
+        self._leafUncert = graph.leafUncert
+        self._node = node
+        self.unit = unitStr
+
+    def __call__(self, values, uncerts=None):
+        if len(values) != self._nInputs:
+            logger.error('The expression has %s inputs, but %s values were supplied', self._nInputs, len(values))
+            raise ValueError(f'The expression has {self._nInputs} inputs, but {len(values)} values were supplied')
+        values = [np.asarray(value, dtype=float) for value in values]
+        if uncerts is None:
+            uncerts = [np.zeros(value.shape) for value in values]
+        else:
+            if len(uncerts) != self._nInputs:
+                logger.error('The expression has %s inputs, but %s uncertanties were supplied', self._nInputs, len(uncerts))
+                raise ValueError(f'The expression has {self._nInputs} inputs, but {len(uncerts)} uncertanties were supplied')
+            uncerts = [np.asarray(uncert, dtype=float) for uncert in uncerts]
+        uncerts = uncerts + self._leafUncert
+        nLeaves = len(uncerts)
+
+        # each node is a value and the derivative of the value with respect to each leaf
+        # The derivative is an array with a row for each leaf
+        nodes = []
+        for i, value in enumerate(values):
+            grad = np.zeros([nLeaves, 1])
+            grad[i] = 1
+            nodes.append((value, grad))
+        for func, args, constants in self._steps:
+            if func is None:
+                # a variable, which was not an input of the function
+                value, row = constants
+                grad = np.zeros([nLeaves, 1])
+                if not row is None:
+                    grad[row] = 1
+                nodes.append((value, grad))
+            else:
+                nodes.append(func(*[nodes[arg] for arg in args], *constants))
+
+        value, grad = nodes[self._node]
+        value = np.array(value, dtype=float, ndmin=1)
+        variance = np.zeros(value.shape)
+        for i, uncert in enumerate(uncerts):
+            variance = variance + (grad[i] * uncert)**2
+        return value, np.sqrt(variance)
+
+
+class _graph():
+    def __init__(self, nInputs) -> None:
+        self.nInputs = nInputs
+        self.steps = []
+        self.leafUncert = []
+        self._variables = {}
+
+    def assertIndependent(self, variables):
+        # two variables are correlated if they depend on the same measurement or on measurements with a covariance
+        owners = {}
+        for k, var in enumerate(list(variables) + list(self._variables.keys())):
+            leaves = var._getSensitivitiesOfLeaves().keys()
+            for leaf in leaves:
+                isShared = leaf in owners and owners[leaf] != k
+                isCovariant = any(other in owners and owners[other] != k for other in leaf.covariance)
+                if isShared or isCovariant:
+                    logger.error('The inputs and the variables used in the function can not be correlated, as the expression uses independent inputs')
+                    raise ValueError('The inputs and the variables used in the function can not be correlated, as the expression uses independent inputs')
+            for leaf in leaves:
+                owners[leaf] = k
+
+    def step(self, func, *args, constants=()):
+        self.steps.append((func, args, constants))
+        return self.nInputs + len(self.steps) - 1
+
+    def node(self, var):
+        # returns the node of the variable in the current unit of the variable
+        if isinstance(var, _tracer) and var._graph is self:
+            node, nodeUnit = var._node, var._nodeUnit
+        elif var in self._variables:
+            node, nodeUnit = self._variables[var]
+        else:
+            # the variable is not an input of the function. It is noted with its current value and uncertanty
+            if var._leaves or var._sparseGrad or np.any(var._uncert != 0):
+                row = self.nInputs + len(self.leafUncert)
+                self.leafUncert.append(np.array(var._uncert))
+            else:
+                row = None
+            node, nodeUnit = self.step(None, constants=(np.array(var._value), row)), var.unit
+
+        # the variable has been converted since the node was created
+        if var.unit != nodeUnit:
+            node = self.convert(node, unit(nodeUnit), var.unit)
+
+        if isinstance(var, _tracer) and var._graph is self:
+            var._node, var._nodeUnit = node, var.unit
+        else:
+            self._variables[var] = (node, var.unit)
+        return node
+
+    def convert(self, node, unitObject, newUnit):
+        converter = unitObject.getConverter(newUnit)
+        offset = converter.offset if not unitObject.isCombinationUnit() else 0
+        return self.step(_convert, node, constants=(converter.scale, offset))
+
+    def toSI(self, var):
+        return self.convert(self.node(var), var._unitObject, var._unitObject._SIBaseUnit)
+
+    def result(self, out, node, unitStr):
+        # the output of the operator might have been converted from the unit it was created in
+        unitObject = unit(unitStr)
+        if out.unit != str(unitObject):
+            node = self.convert(node, unitObject, out.unit)
+        return _tracer(out._value, out.unit, out._uncert, self, node)
+
+    def add(self, a, b):
+        out = variable.__add__(a, b)
+        _, outputUnit = a._unitObject + b._unitObject
+        return self.result(out, self.step(_add, self.toSI(a), self.toSI(b)), outputUnit)
+
+    def sub(self, a, b):
+        out = variable.__sub__(a, b)
+        _, outputUnit = a._unitObject - b._unitObject
+        return self.result(out, self.step(_sub, self.toSI(a), self.toSI(b)), outputUnit)
+
+    def mul(self, a, b):
+        out = variable.__mul__(a, b)
+        outputUnit = a._unitObject * b._unitObject
+        return self.result(out, self.step(_mul, self.node(a), self.node(b)), outputUnit)
+
+    def div(self, a, b):
+        out = variable.__truediv__(a, b)
+        outputUnit = a._unitObject / b._unitObject
+        return self.result(out, self.step(_div, self.node(a), self.node(b)), outputUnit)
+
+    def pow(self, a, b):
+        out = variable.__pow__(a, b)
+        outputUnit = a._unitObject ** b.value
+        return self.result(out, self.step(_pow, self.node(a), self.node(b)), outputUnit)
+
+    def function(self, out, func, a, *constants):
+        return self.result(out, self.step(func, self.node(a), constants=constants), out.unit)
+
+
+class _tracer(variable):
+    # a variable, which notes the operations performed on it in a graph
+    __slots__ = ('_graph', '_node', '_nodeUnit')
+
+    def __init__(self, value, unitStr, uncert, graph, node) -> None:
+        super().__init__(value, unitStr, uncert)
+        self._graph = graph
+        self._node = node
+        self._nodeUnit = self.unit
+
+    def __add__(self, other):
+        if not isinstance(other, variable):
+            other = variable(other, self.unit)
+        return self._graph.add(self, other)
+
+    def __radd__(self, other):
+        if not isinstance(other, variable):
+            return self + other
+        return self._graph.add(other, self)
+
+    def __sub__(self, other):
+        if not isinstance(other, variable):
+            other = variable(other, self.unit)
+        return self._graph.sub(self, other)
+
+    def __rsub__(self, other):
+        if not isinstance(other, variable):
+            return - self + other
+        return self._graph.sub(other, self)
+
+    def __mul__(self, other):
+        if not isinstance(other, variable):
+            other = variable(other)
+        return self._graph.mul(self, other)
+
+    def __rmul__(self, other):
+        if not isinstance(other, variable):
+            return self * other
+        return self._graph.mul(other, self)
+
+    def __truediv__(self, other):
+        if not isinstance(other, variable):
+            other = variable(other)
+        return self._graph.div(self, other)
+
+    def __rtruediv__(self, other):
+        if not isinstance(other, variable):
+            other = variable(other)
+        return self._graph.div(other, self)
+
+    def __pow__(self, other):
+        if not isinstance(other, variable):
+            other = variable(other)
+        return self._graph.pow(self, other)
+
+    def __rpow__(self, other):
+        if not isinstance(other, variable):
+            other = variable(other, '1')
+        return self._graph.pow(other, self)
+
+    # the in-place operators create a new node in the graph
+    def __iadd__(self, other):
+        return self + other
+
+    def __isub__(self, other):
+        return self - other
+
+    def __imul__(self, other):
+        return self * other
+
+    def __itruediv__(self, other):
+        return self / other
+
+    def exp(self):
+        return self._graph.function(variable.exp(self), _exp, self)
+
+    def sqrt(self):
+        return self._graph.function(variable.sqrt(self), _sqrt, self)
+
+    def log(self):
+        return self._graph.function(variable.log(self), _log, self)
+
+    def log10(self):
+        return self._graph.function(variable.log10(self), _log10, self)
+
+    def sin(self):
+        out = variable.sin(self)
+        factor = 1 if self._unitObject._assertEqual('rad') else np.pi / 180
+        return self._graph.function(out, _sin, self, factor)
+
+    def cos(self):
+        out = variable.cos(self)
+        factor = 1 if self.unit == 'rad' else np.pi / 180
+        return self._graph.function(out, _cos, self, factor)
+
+    def tan(self):
+        out = variable.tan(self)
+        factor = 1 if self.unit == 'rad' else np.pi / 180
+        return self._graph.function(out, _tan, self, factor)
+
+    def __abs__(self):
+        return self._graph.function(variable.__abs__(self), _abs, self)
+
+    def __getitem__(self, index):
+        logger.error('You can not index a variable in a traced function')
+        raise ValueError('You can not index a variable in a traced function')
+
+    def __array_function__(self, func, types, args, kwargs):
+        logger.error('The function %s can not be used in a traced function', func.__name__)
+        raise ValueError(f'The function {func.__name__} can not be used in a traced function')
+
+
+# the operations of the expression. Each operation takes the nodes (value, gradient) of the arguments
+# and returns the node of the result. The gradients are determined using forward mode differentiation
+def _convert(a, scale, offset):
+    return a[0] * scale + offset, a[1] * scale
+
+
+def _add(a, b):
+    return a[0] + b[0], a[1] + b[1]
+
+
+def _sub(a, b):
+    return a[0] - b[0], a[1] - b[1]
+
+
+def _mul(a, b):
+    return a[0] * b[0], a[1] * b[0] + a[0] * b[1]
+
+
+def _div(a, b):
+    return a[0] / b[0], a[1] / b[0] - a[0] / b[0]**2 * b[1]
+
+
+def _pow(a, b):
+    value = a[0] ** b[0]
+    grad = b[0] * a[0] ** (b[0] - 1) * a[1]
+    if np.any(b[1]):
+        grad = grad + value * np.log(a[0]) * b[1]
+    return value, grad
+
+
+def _exp(a):
+    value = np.exp(a[0])
+    return value, value * a[1]
+
+
+def _sqrt(a):
+    value = np.sqrt(a[0])
+    return value, 0.5 / value * a[1]
+
+
+def _log(a):
+    return np.log(a[0]), a[1] / a[0]
+
+
+def _log10(a):
+    return np.log10(a[0]), a[1] / (a[0] * np.log(10))
+
+
+def _sin(a, factor):
+    return np.sin(factor * a[0]), factor * np.cos(factor * a[0]) * a[1]
+
+
+def _cos(a, factor):
+    return np.cos(factor * a[0]), -factor * np.sin(factor * a[0]) * a[1]
+
+
+def _tan(a, factor):
+    return np.tan(factor * a[0]), factor / np.cos(factor * a[0])**2 * a[1]
+
+
+def _abs(a):
+    return np.abs(a[0]), np.where(a[0] < 0, -1.0, 1.0) * a[1]
@@ -1,29 +1,131 @@
 import logging
 logger = logging.getLogger(__name__)
+import sys
+import threading
+from collections import OrderedDict
 import numpy as np
-from dataUncert.unitSystem import knownCharacters, knownPrefixes, knownUnits, baseUnit, _unitConversion, knownUnitsDict
+from dataUncert.unitSystem import knownCharacters, knownPrefixes, knownUnits, baseUnit, _unitConversion, knownUnitsDict, baseDimensions, knownDimensions
+
+
+class _unitCache():
+    # a bounded cache, which discards the least recently used item when the cache is full.
+    # The cache is guarded by a lock, such that it can be used from multiple threads
+
+    def __init__(self, maxSize) -> None:
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                item = self._items[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item
+
+    def add(self, key, item):
+        with self._lock:
+            self._items[key] = item
+            if len(self._items) > self.maxSize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._items), 'maxSize': self.maxSize}
+
+
+# cache of the parsed units. The key is the unit string without any spaces
+_parsedUnits = _unitCache(maxSize=1024)
+
+# cache of the resulting units when multiplying, dividing or raising units to a power.
+# The key is (unitStr, unitStr or power, operator)
+_unitAlgebra = _unitCache(maxSize=4096)
+
+# cache of the converters between two units. The key is (unitStr, unitStr)
+_unitConverters = _unitCache(maxSize=4096)
+
+# the dimensions of a temperature and a temperature difference
+_temperatureAndTemperatureDifference = [
+    (knownDimensions['K'], knownDimensions['DELTAK']),
+    (knownDimensions['DELTAK'], knownDimensions['K'])
+]
 
 
 class unit():
+    __slots__ = (
+        'unitStr', '_dimension', '_SIBaseUnit', '_converterToSI',
+        'upper', 'upperPrefix', 'upperExp', 'lower', 'lowerPrefix', 'lowerExp'
+    )
 
     def __init__(self, unitStr) -> None:
+        self._setUnit(unitStr)
+
+    def _setUnit(self, unitStr):
+        parsed = unit._getParsedUnit(unitStr)
+
+        # copy the lists, as they are modified by some of the methods
+        upper, upperPrefix, upperExp, lower, lowerPrefix, lowerExp, self.unitStr, self._dimension, self._SIBaseUnit, self._converterToSI, _ = parsed
+        self.upper, self.upperPrefix, self.upperExp = list(upper), list(upperPrefix), list(upperExp)
+        self.lower, self.lowerPrefix, self.lowerExp = list(lower), list(lowerPrefix), list(lowerExp)
+
+    @staticmethod
+    def _getParsedUnit(unitStr):
         if unitStr == '':
             unitStr = '1'
 
+        # look for the unit in the cache before parsing the unit
+        key = sys.intern(unitStr.replace(' ', ''))
+        parsed = _parsedUnits.get(key)
+        if parsed is None:
+            parsed = unit._parseUnit(unitStr)
+            _parsedUnits.add(key, parsed)
+        return parsed
+
+    @staticmethod
+    def _parseUnit(unitStr):
         # remove any unknown characters
-        unitStr = self._formatUnit(unitStr)
+        unitStr = unit._formatUnit(unitStr)
 
         # split the unit in upper and lower
-        self.upper, self.upperPrefix, self.upperExp, self.lower, self.lowerPrefix, self.lowerExp = self._getLists(unitStr)
+        upper, upperPrefix, upperExp, lower, lowerPrefix, lowerExp = unit._getLists(unitStr)
 
         # create the unit string
-        self.unitStr = self._createUnitString()
+        unitStr = unit._combineUpperAndLower(upper, upperPrefix, upperExp, lower, lowerPrefix, lowerExp)
+
+        # the dimension of the unit and the SI base unit
+        dimension = unit._getDimension(upper, upperExp, lower, lowerExp)
+        SIBaseUnit = unit._dimensionToString(dimension)
 
-        self._SIBaseUnit = self._getSIBaseUnit(self.upper, self.upperExp, self.lower, self.lowerExp)
-        self._converterToSI = self.getConverter(self._SIBaseUnit)
+        # the units sorted by their name. This is used to determine if two units are identical
+        sortedUnits = (
+            tuple(sorted(zip(upper, upperExp, [elem if not elem is None else '' for elem in upperPrefix]))),
+            tuple(sorted(zip(lower, lowerExp, [elem if not elem is None else '' for elem in lowerPrefix])))
+        )
 
-    def _createUnitString(self):
-        return self._combineUpperAndLower(self.upper, self.upperPrefix, self.upperExp, self.lower, self.lowerPrefix, self.lowerExp)
+        # determine the conversion to the SI base unit
+        converterToSI = unit._getConversion(upper, upperPrefix, upperExp, lower, lowerPrefix, lowerExp)
+
+        return (
+            tuple(upper), tuple(upperPrefix), tuple(upperExp),
+            tuple(lower), tuple(lowerPrefix), tuple(lowerExp),
+            unitStr, dimension, SIBaseUnit, converterToSI, sortedUnits
+        )
+
+    @staticmethod
+    def cacheInfo():
+        return {'units': _parsedUnits.info(), 'algebra': _unitAlgebra.info(), 'converters': _unitConverters.info()}
 
     @staticmethod
     def _cancleUnits(upper, upperPrefix, upperExp, lower, lowerPrefix, lowerExp):
@@ -232,47 +334,8 @@ class unit():
 
     @staticmethod
     def _assertEqualStatic(a, b):
-
-        aUpper, aUpperPrefix, aUpperExp, aLower, aLowerPrefix, aLowerExp = unit._getLists(a)
-        bUpper, bUpperPrefix, bUpperExp, bLower, bLowerPrefix, bLowerExp = unit._getLists(b)
-
-        if bool(aLower) != bool(bLower):
-            return False
-
-        aUpperIndexes = np.argsort(aUpper)
-        aLowerIndexes = np.argsort(aLower)
-        bUpperIndexes = np.argsort(bUpper)
-        bLowerIndexes = np.argsort(bLower)
-
-        aUpperSorted = list(np.sort(aUpper))
-        aLowerSorted = list(np.sort(aLower))
-        bUpperSorted = list(np.sort(bUpper))
-        bLowerSorted = list(np.sort(bLower))
-
-        aUpperExpSorted = [aUpperExp[elem] for elem in aUpperIndexes]
-        aLowerExpSorted = [aLowerExp[elem] for elem in aLowerIndexes]
-        bUpperExpSorted = [bUpperExp[elem] for elem in bUpperIndexes]
-        bLowerExpSorted = [bLowerExp[elem] for elem in bLowerIndexes]
-
-        aUpperPrefixSorted = [aUpperPrefix[elem] for elem in aUpperIndexes]
-        aLowerPrefixSorted = [aLowerPrefix[elem] for elem in aLowerIndexes]
-        bUpperPrefixSorted = [bUpperPrefix[elem] for elem in bUpperIndexes]
-        bLowerPrefixSorted = [bLowerPrefix[elem] for elem in bLowerIndexes]
-
-        if aUpperSorted != bUpperSorted:
-            return False
-        if aLowerSorted != bLowerSorted:
-            return False
-        if aUpperExpSorted != bUpperExpSorted:
-            return False
-        if aLowerExpSorted != bLowerExpSorted:
-            return False
-        if aUpperPrefixSorted != bUpperPrefixSorted:
-            return False
-        if aLowerPrefixSorted != bLowerPrefixSorted:
-            return False
-
-        return True
+        # the units are identical if they contain the same units with the same prefixes and exponents
+        return unit._getParsedUnit(a)[-1] == unit._getParsedUnit(b)[-1]
 
     @staticmethod
     def _removePrefixFromUnit(unit):
@@ -300,63 +363,25 @@ class unit():
         return unit, prefix
 
     @staticmethod
-    def _getSIBaseUnit(upper, upperExp, lower, lowerExp):
+    def _getDimension(upper, upperExp, lower, lowerExp):
+        # add the dimensions of each unit. The units in the lower part of the unit are subtracted
+        dimension = [0] * len(baseDimensions)
+        for units, exponents, sign in [[upper, upperExp, 1], [lower, lowerExp, -1]]:
+            for u, exp in zip(units, exponents):
+                u = unit._removePrefixFromUnit(u)[0]
+                for i, d in enumerate(knownDimensions[u]):
+                    dimension[i] += sign * exp * d
+        return tuple(dimension)
 
-        def addUnitsMultipleTimes(units, unitExps):
-            out = []
-            for unit, unitExp in zip(units, unitExps):
-                for _ in range(unitExp):
-                    out.append(unit)
-            return out
-
-        upper = addUnitsMultipleTimes(upper, upperExp)
-        lower = addUnitsMultipleTimes(lower, lowerExp)
-
-        # remove the prefix - this is just a scaling so this does not change the SI base unit
-        upper = [unit._removePrefixFromUnit(elem)[0] for elem in upper]
-        lower = [unit._removePrefixFromUnit(elem)[0] for elem in lower]
-
-        # return the splitted version of the base unit
-        upper = [unit._splitCompositeUnit(knownUnits[elem][0]) for elem in upper]
-        lower = [unit._splitCompositeUnit(knownUnits[elem][0]) for elem in lower]
-
-        # combine the upper and lower
-        tmpUpper = [elem[0] for elem in upper] + [elem[1] for elem in lower]
-        tmpLower = [elem[1] for elem in upper] + [elem[0] for elem in lower]
-        upper = [elem for L in tmpUpper for elem in L]
-        lower = [elem for L in tmpLower for elem in L]
-
-        # remove the exponents
-        tmpUpper = [unit._removeExponentFromUnit(elem) for elem in upper]
-        tmpLower = [unit._removeExponentFromUnit(elem) for elem in lower]
-        upper = [elem[0] for elem in tmpUpper]
-        tmpUpperExp = [elem[1]for elem in tmpUpper]
-        lower = [elem[0] for elem in tmpLower]
-        tmpLowerExp = [elem[1]for elem in tmpLower]
-
-        upperSet = list(set(upper))
-        upperSet.sort()
-        lowerSet = list(set(lower))
-        lowerSet.sort()
-        lenUpperSet = len(upperSet)
-        lenLowerSet = len(lowerSet)
-        upperExp = [0] * lenUpperSet
-        lowerExp = [0] * lenLowerSet
-        upperPrefix = [None] * lenUpperSet
-        lowerPrefix = [None] * lenLowerSet
-        for i, u in enumerate(upperSet):
-            indexes = [_ for _, elem in enumerate(upper) if elem == u]
-            upperExp[i] = sum([tmpUpperExp[elem] for elem in indexes])
-        for i, l in enumerate(lowerSet):
-            indexes = [_ for _, elem in enumerate(lower) if elem == l]
-            lowerExp[i] = sum([tmpLowerExp[elem] for elem in indexes])
-        upper, lower = upperSet, lowerSet
-
-        upper, upperPrefix, upperExp, lower, lowerPrefix, lowerExp = unit._cancleUnits(
-            upper, upperPrefix, upperExp, lower, lowerPrefix, lowerExp
-        )
+    @staticmethod
+    def _dimensionToString(dimension):
+        upper = [u if exp == 1 else f'{u}{exp}' for u, exp in zip(baseDimensions, dimension) if exp > 0]
+        lower = [u if exp == -1 else f'{u}{-exp}' for u, exp in zip(baseDimensions, dimension) if exp < 0]
 
-        return unit._combineUpperAndLower(upper, upperPrefix, upperExp, lower, lowerPrefix, lowerExp)
+        out = '-'.join(upper) if upper else '1'
+        if lower:
+            out += '/' + '-'.join(lower)
+        return out
 
     def isCombinationUnit(self):
         if len(self.upper) > 1:
@@ -409,45 +434,57 @@ class unit():
         return self._assertEqualStatic(self.unitStr, other)
 
     def __add__(self, other):
-        # test if the units are identical
-        if self._assertEqual(other):
-            return True, self._SIBaseUnit
-
-        # test if the SI base units are identical
-        if self._SIBaseUnit == other._SIBaseUnit:
+        # test if the dimensions are identical
+        if self._dimension == other._dimension:
             return True, self._SIBaseUnit
 
         # test if one is a temperature, and the other is a temperature difference
-        SIBaseUnits = [self._SIBaseUnit, other._SIBaseUnit]
-        if 'K' in SIBaseUnits and 'DELTAK' in SIBaseUnits:
+        if (self._dimension, other._dimension) in _temperatureAndTemperatureDifference:
             return True, 'K'
 
         # return false
         return False, None
 
     def __sub__(self, other):
-        # test if the units are identical
-        if self._assertEqual(other):
-            if self._SIBaseUnit == 'K':
+        # test if the dimensions are identical
+        if self._dimension == other._dimension:
+            # the difference between two identical temperatures is a temperature difference
+            if self._SIBaseUnit == 'K' and self._assertEqual(other):
                 return True, 'DELTA' + self.unitStr
             return True, self._SIBaseUnit
 
-        # test if the SI base units are identical
-        if self._SIBaseUnit == other._SIBaseUnit:
-            return True, self._SIBaseUnit
-
         # test if one is a temperature, and the other is a temperature difference
-        SIBaseUnits = [self._SIBaseUnit, other._SIBaseUnit]
-        if 'K' in SIBaseUnits and 'DELTAK' in SIBaseUnits:
+        if (self._dimension, other._dimension) in _temperatureAndTemperatureDifference:
             return True, 'K'
 
         # return false
         return False, None
 
     def __mul__(self, other):
-        return unit._multiply(self.unitStr, other.unitStr)
+        key = (self.unitStr, other.unitStr, '*')
+        out = _unitAlgebra.get(key)
+        if out is None:
+            out = unit._multiply(self.unitStr, other.unitStr)
+            _unitAlgebra.add(key, out)
+        return out
 
     def __truediv__(self, other):
+        key = (self.unitStr, other.unitStr, '/')
+        out = _unitAlgebra.get(key)
+        if out is None:
+            out = self._divide(other)
+            _unitAlgebra.add(key, out)
+        return out
+
+    def __pow__(self, power):
+        key = (self.unitStr, power, '**')
+        out = _unitAlgebra.get(key)
+        if out is None:
+            out = self._power(power)
+            _unitAlgebra.add(key, out)
+        return out
+
+    def _divide(self, other):
 
         if self._SIBaseUnit == 'K':
             a = 'DELTA' + self.unitStr
@@ -472,7 +509,7 @@ class unit():
 
         return unit._multiply(a, b)
 
-    def __pow__(self, power):
+    def _power(self, power):
 
         if power == 0:
             return '1'
@@ -522,37 +559,25 @@ class unit():
                 return self._combineUpperAndLower(self.upper, self.upperPrefix, upperExp, self.lower, self.lowerPrefix, lowerExp)
 
     def getConverter(self, newUnit):
+        key = (self.unitStr, newUnit.replace(' ', ''))
+        out = _unitConverters.get(key)
+        if out is None:
+            out = self._getConverter(newUnit)
+            _unitConverters.add(key, out)
+        return out
+
+    def _getConverter(self, newUnit):
         newUnit = unit._formatUnit(newUnit)
 
         # get the upper, upperExp, lower and lowerExp of the newUnit without creating a unit
         otherUpper, otherUpperPrefix, otherUpperExp, otherLower, otherLowerPrefix, otherLowerExp = self._getLists(newUnit)
 
-        # determine if the SI bases are identical
-        otherSIBase = self._getSIBaseUnit(otherUpper, otherUpperExp, otherLower, otherLowerExp)
-
-        if unit._assertEqualStatic(self._SIBaseUnit, otherSIBase) == False:
+        # determine if the dimensions are identical
+        if self._dimension != self._getDimension(otherUpper, otherUpperExp, otherLower, otherLowerExp):
             raise ValueError(f'You tried to convert from {self} to {newUnit}. But these do not have the same base units')
 
-        # initialize the scale and offset
-        out = _unitConversion(1, 0)
-
-        # get conversions for all upper and lower units in self
-        upperConversions = [knownUnits[elem][1] for elem in self.upper]
-        lowerConversions = [knownUnits[elem][1] for elem in self.lower]
-
-        # modify the scale and offset using the conversions
-        conversions = upperConversions + lowerConversions
-        conversionBool = [True] * len(upperConversions) + [False] * len(lowerConversions)
-        prefixes = self.upperPrefix + self.lowerPrefix
-        exponents = self.upperExp + self.lowerExp
-        for conv, prefix, exp, upperBool in zip(conversions, prefixes, exponents, conversionBool):
-            if not prefix is None:
-                conv *= knownPrefixes[prefix]
-            for _ in range(exp):
-                if upperBool:
-                    out *= conv
-                else:
-                    out /= conv
+        # start from the conversion of self to the SI unit system
+        out = self._converterToSI
 
         # get all conversions from the upper and lower units in the new unit
         upperConversions = [knownUnits[elem][1] for elem in otherUpper]
@@ -576,19 +601,31 @@ class unit():
 
         return out
 
-    def convert(self, unitStr):
-        if unitStr == '':
-            unitStr = '1'
+    @staticmethod
+    def _getConversion(upper, upperPrefix, upperExp, lower, lowerPrefix, lowerExp):
+        # initialize the scale and offset
+        out = _unitConversion(1, 0)
 
-        # remove any unknown characters
-        unitStr = self._formatUnit(unitStr)
+        # get conversions for all upper and lower units
+        upperConversions = [knownUnits[elem][1] for elem in upper]
+        lowerConversions = [knownUnits[elem][1] for elem in lower]
 
-        # split the unit in upper and lower
-        self.upper, self.upperPrefix, self.upperExp, self.lower, self.lowerPrefix, self.lowerExp = self._getLists(unitStr)
+        # modify the scale and offset using the conversions
+        conversions = upperConversions + lowerConversions
+        conversionBool = [True] * len(upperConversions) + [False] * len(lowerConversions)
+        prefixes = upperPrefix + lowerPrefix
+        exponents = upperExp + lowerExp
+        for conv, prefix, exp, upperBool in zip(conversions, prefixes, exponents, conversionBool):
+            if not prefix is None:
+                conv *= knownPrefixes[prefix]
+            for _ in range(exp):
+                if upperBool:
+                    out *= conv
+                else:
+                    out /= conv
 
-        # create the unit string
-        self.unitStr = self._createUnitString()
+        return _unitConversion(float(out.scale), float(out.offset))
 
-        self._SIBaseUnit = self._getSIBaseUnit(self.upper, self.upperExp, self.lower, self.lowerExp)
-        self._converterToSI = self.getConverter(self._SIBaseUnit)
+    def convert(self, unitStr):
+        self._setUnit(unitStr)
 
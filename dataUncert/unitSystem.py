@@ -4,6 +4,7 @@ logger = logging.getLogger(__name__)
 
 
 class _unitConversion():
+    __slots__ = ('scale', 'offset')
 
     def __init__(self, scale, offset=0) -> None:
         self.scale = scale
@@ -172,6 +173,35 @@ for key, d in knownUnitsDict.items():
         else:
             raise Warning(f'The unit {item} known in more than one unit system')
 
+# determine the SI base units of the unit system.
+# The dimension of any unit is described by a vector with the exponent of each of these base units
+baseDimensions = []
+for key in knownUnitsDict:
+    for u in key.replace('/', '-').split('-'):
+        u = u.rstrip('0123456789')
+        if u and u not in baseDimensions:
+            baseDimensions.append(u)
+baseDimensions.sort()
+
+
+def _getDimensionOfSystem(system):
+    dimension = [0] * len(baseDimensions)
+    system = system.split('/')
+    for units, sign in zip(system, [1, -1]):
+        for u in units.split('-'):
+            exponent = u[len(u.rstrip('0123456789')):]
+            exponent = int(exponent) if exponent else 1
+            u = u.rstrip('0123456789')
+            if u:
+                dimension[baseDimensions.index(u)] += sign * exponent
+    return tuple(dimension)
+
+
+knownDimensions = {}
+for key, d in knownUnitsDict.items():
+    for item in d:
+        knownDimensions[item] = _getDimensionOfSystem(key)
+
 # determine the known characters within the unit system
 knownCharacters = list(knownUnits.keys()) + list(knownPrefixes.keys())
 knownCharacters = ''.join(knownCharacters)
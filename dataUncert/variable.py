@@ -1,4 +1,3 @@
-from copy import deepcopy
 import logging
 logger = logging.getLogger(__name__)
 import numpy as np
@@ -6,11 +5,64 @@ from dataUncert.unit import unit
 
 HANDLED_FUNCTIONS = {}
 
+# the numpy ufuncs, which are evaluated by the methods and the operators of the variables
+HANDLED_UFUNCS = {
+    np.exp: 'exp',
+    np.sqrt: 'sqrt',
+    np.log: 'log',
+    np.log10: 'log10',
+    np.sin: 'sin',
+    np.cos: 'cos',
+    np.tan: 'tan',
+    np.negative: '__neg__',
+    np.absolute: '__abs__'
+}
+HANDLED_BINARY_UFUNCS = {
+    np.add: ('__add__', '__radd__'),
+    np.subtract: ('__sub__', '__rsub__'),
+    np.multiply: ('__mul__', '__rmul__'),
+    np.true_divide: ('__truediv__', '__rtruediv__'),
+    np.power: ('__pow__', '__rpow__'),
+    np.less: ('__lt__', '__gt__'),
+    np.less_equal: ('__le__', '__ge__'),
+    np.greater: ('__gt__', '__lt__'),
+    np.greater_equal: ('__ge__', '__le__'),
+    np.equal: ('__eq__', '__eq__'),
+    np.not_equal: ('__ne__', '__ne__')
+}
+
+# when the uncertanty is lazy, the arithmetic operations only note the values and the sensitivities of the variables.
+# The uncertanty of a variable is then calculated the first time it is needed
+_lazyUncertanty = False
+
+
+def setLazyUncertanty(lazy=True):
+    global _lazyUncertanty
+    _lazyUncertanty = lazy
+
+
+# variables with more datapoints than the threshold are printed as a summary of the first and the last datapoints.
+# The threshold can be set to None in order to print all datapoints
+_printThreshold = 1000
+_printEdgeItems = 3
+
+
+def setPrintOptions(threshold=1000, edgeitems=3):
+    global _printThreshold, _printEdgeItems
+    _printThreshold = threshold
+    _printEdgeItems = edgeitems
+
 
 class variable():
+    # many variables are created in the operations. The attributes are therefore stored in slots instead of a dictionary
+    __slots__ = (
+        '_unitObject', 'nDigits', '_value', '_uncertArray', '_uncertIsStale', '_converterToSI',
+        '_leaves', '_leafIndex', '_leafMaps', '_grad', '_gradBuffer', '_sparseGrad', 'covariance'
+    )
+
     def __init__(self, value, unitStr='', uncert=None, nDigits=3) -> None:
 
-        logger.info(f'Creating variable with a value of {value}, a unit of "{unitStr}" and an uncertanty of {uncert}')
+        logger.info('Creating variable with a value of %s, a unit of "%s" and an uncertanty of %s', value, unitStr, uncert)
 
         # create a unit object
         self._unitObject = unitStr if isinstance(unitStr, unit) else unit(unitStr)
@@ -47,9 +99,42 @@ class variable():
         self._getConverterToSI()
 
         # uncertanty
-        self.dependsOn = {}
+        # the sensitivities of the variable to the measurements (leaves) it depends on are stored in a
+        # single array with a row for each leaf and a coloumn for each datapoint. The sensitivities are in SI units
+        self._leaves = []
+        self._leafIndex = {}
+        self._grad = None
+        self._gradBuffer = None
         self.covariance = {}
 
+        # if the variable has been indexed, the datapoints of a leaf are not the datapoints of the variable.
+        # The map of each leaf is then an array with the index of the datapoint of the leaf for each datapoint of the variable
+        self._leafMaps = []
+
+        # a datapoint of a reduced variable (the sum, mean etc.) depends on many datapoints of each leaf.
+        # These sensitivities are stored for each leaf as three arrays: the datapoints of the variable,
+        # the datapoints of the leaf and the sensitivities. The arrays are sorted by the datapoints of the variable
+        self._sparseGrad = {}
+
+    @classmethod
+    def _fromArrays(cls, value, unitObject, uncert=None, nDigits=3):
+        # creates a variable from float arrays and a unit object, which is owned by the new variable.
+        # The inputs are not checked or converted. This is used internally, where the inputs are known to be valid
+        var = cls.__new__(cls)
+        var._unitObject = unitObject
+        var.nDigits = nDigits
+        var._value = value
+        var._uncert = np.zeros(len(value)) if uncert is None else uncert
+        var._converterToSI = unitObject._converterToSI
+        var._leaves = []
+        var._leafIndex = {}
+        var._grad = None
+        var._gradBuffer = None
+        var.covariance = {}
+        var._leafMaps = []
+        var._sparseGrad = {}
+        return var
+
     def _getConverterToSI(self):
         self._converterToSI = self._unitObject._converterToSI
 
@@ -63,6 +148,17 @@ class variable():
     def unit(self):
         return str(self._unitObject)
 
+    @property
+    def _uncert(self):
+        if self._uncertIsStale:
+            self._evaluateUncertanty()
+        return self._uncertArray
+
+    @_uncert.setter
+    def _uncert(self, uncert):
+        self._uncertArray = uncert
+        self._uncertIsStale = False
+
     @property
     def uncert(self):
         if self.len() == 1:
@@ -70,68 +166,179 @@ class variable():
         return self._uncert
 
     def convert(self, newUnit):
-        oldUnit = self._unitObject
+        oldUnit = self.unit
         oldValue = self._value
-        oldUncert = self._uncert
 
         converter = self._unitObject.getConverter(newUnit)
         self._value = converter.convert(self._value, useOffset=not self._unitObject.isCombinationUnit())
-        self._uncert = converter.convert(self._uncert, useOffset=False)
+
+        # the sensitivities are stored in SI units and are not changed by the conversion.
+        # A stale uncertanty is kept stale and is evaluated in the new unit, when it is needed
+        if not self._uncertIsStale:
+            self._uncert = converter.convert(self._uncertArray, useOffset=False)
         self._unitObject.convert(newUnit)
 
         # update the converter to SI
         self._getConverterToSI()
 
-        logger.info(f'Converted the varible from {oldValue} +/- {oldUncert} [{oldUnit}] to {self._value} +/- {self._uncert} [{self.unit}]')
+        logger.info('Converted the varible from %s [%s] to %s [%s]', oldValue, oldUnit, self._value, self.unit)
+
+    def _getValueInSI(self):
+        # returns the value in the SI unit system and the scale of the conversion
+        converter = self._converterToSI
+        return converter.convert(self._value, useOffset=not self._unitObject.isCombinationUnit()), converter.scale
 
     def len(self):
         return len(self._value)
 
     def __getitem__(self, index):
-        if isinstance(index, int) or isinstance(index, slice):
-            if index >= self.len():
-                raise IndexError('Index out of bounds')
-            if self.len() == 1:
-                if index != 0:
-                    raise IndexError('Index out of bound')
-                return variable(self.value, self._unitObject, self.uncert)
-            return variable(self.value[index], self._unitObject, self.uncert[index])
+        # a tuple or a list is a list of indices
+        if isinstance(index, (tuple, list)):
+            index = np.array(index)
+        try:
+            indices = np.atleast_1d(np.arange(self.len())[index])
+        except IndexError:
+            raise IndexError('Index out of bounds')
+
+        # slices are views of the values
+        if not isinstance(index, slice):
+            index = indices
+        var = variable._fromArrays(self._value[index], unit(self.unit))
+
+        # the indexed variable depends on the datapoints of the leaves given by the indices
+        if self._leaves or self._sparseGrad:
+            leaves = self._leaves
+            leafMaps = []
+            for leaf, leafMap in zip(self._leaves, self._leafMaps):
+                if leafMap is None:
+                    if leaf.len() == 1:
+                        leafMaps.append(None)
+                        continue
+                    leafMap = np.arange(leaf.len())
+                leafMaps.append(leafMap[indices])
+            grad = self._grad[:, indices] if leaves else None
+
+            sparseGrad = {}
+            for leaf, (points, leafPoints, g) in self._sparseGrad.items():
+                # find the range of the sensitivities of each index
+                start = np.searchsorted(points, indices, 'left')
+                counts = np.searchsorted(points, indices, 'right') - start
+                entries = np.repeat(start - np.cumsum(counts) + counts, counts) + np.arange(np.sum(counts))
+                sparseGrad[leaf] = (np.repeat(np.arange(len(indices)), counts), leafPoints[entries], g[entries])
+            var._sparseGrad = sparseGrad
+        else:
+            leaves = [self]
+            leafMaps = [indices]
+            grad = np.ones([1, len(indices)])
+
+        # rows of different datapoints of a leaf might depend on the same datapoints after the indexing, for example (a - a[0])[0].
+        # The sensitivities of these rows are summed, such that each leaf and map of the leaf only has a single row
+        leafIndex = {}
+        rows = [leafIndex.setdefault(variable._getLeafKey(leaf, leafMap), len(leafIndex)) for leaf, leafMap in zip(leaves, leafMaps)]
+        if len(leafIndex) < len(leaves):
+            mergedGrad = np.zeros([len(leafIndex), len(indices)])
+            np.add.at(mergedGrad, rows, grad)
+            firstRows = np.unique(rows, return_index=True)[1]
+            leaves = [leaves[i] for i in firstRows]
+            leafMaps = [leafMaps[i] for i in firstRows]
+            grad = mergedGrad
+        var._leaves = list(leaves)
+        var._leafMaps = leafMaps
+        var._leafIndex = leafIndex
+        var._grad = grad
+
+        # the uncertanty of each datapoint is not changed by the indexing
+        if self._uncertIsStale:
+            var._calculateUncertanty()
         else:
-            val = [self.value[elem]for elem in index]
-            unc = [self.uncert[elem]for elem in index]
-            return variable(val, self._unitObject, unc)
+            var._uncert = self._uncertArray[index]
+        return var
 
     def printUncertanty(self, value, uncert):
         # function to print number
-        if uncert == 0 or uncert is None or np.isnan(uncert):
-            return f'{value:.{self.nDigits}g}', None
-
-        digitsUncert = -int(np.floor(np.log10(np.abs(uncert))))
-
-        if value != 0:
-            digitsValue = -int(np.floor(np.log10(np.abs(value))))
-        else:
-            digitsValue = 0
-
-        # uncertanty
-        if digitsUncert > 0:
-            uncert = f'{uncert:.{1}g}'
-        else:
-            nDecimals = len(str(int(uncert)))
-            uncert = int(np.around(uncert, -nDecimals + 1))
-
-        # value
-        if digitsValue <= digitsUncert:
-            if digitsUncert > 0:
-                value = f'{value:.{digitsUncert}f}'
-            else:
-                value = int(np.around(value, - nDecimals + 1))
-        else:
-            value = '0'
-            if digitsUncert > 0:
-                value += '.' + ''.join(['0'] * digitsUncert)
+        if uncert is None:
+            uncert = 0
+        values, uncerts = self._printUncertanties(np.array([value], dtype=float), np.array([uncert], dtype=float))
+        return values[0], uncerts[0]
+
+    @staticmethod
+    def _getDigits(values, uncerts):
+        # returns which datapoints have an uncertanty, the number of decimals of the uncertanties
+        # and if the values are shown or printed as zero, because they are smaller than the uncertanties
+        hasUncert = (uncerts != 0) & np.isfinite(uncerts)
+        digitsUncert = np.zeros(len(values), dtype=int)
+        digitsUncert[hasUncert] = -np.floor(np.log10(np.abs(uncerts[hasUncert]))).astype(int)
+        digitsValue = np.zeros(len(values), dtype=int)
+        isNonZero = (values != 0) & np.isfinite(values)
+        digitsValue[isNonZero] = -np.floor(np.log10(np.abs(values[isNonZero]))).astype(int)
+        return hasUncert, digitsUncert, digitsValue <= digitsUncert
+
+    def getRounded(self):
+        # returns the values and the uncertanties rounded as they are printed and the number of decimals they are rounded to.
+        # The values without an uncertanty are rounded to nDigits significant digits
+        values = np.asarray(self._value, dtype=float)
+        uncerts = np.asarray(self._uncert, dtype=float)
+        hasUncert, decimals, isValueShown = variable._getDigits(values, uncerts)
+        isNonZero = ~hasUncert & (values != 0) & np.isfinite(values)
+        decimals[isNonZero] = self.nDigits - 1 - np.floor(np.log10(np.abs(values[isNonZero]))).astype(int)
+
+        roundedValues = np.zeros(len(values))
+        roundedUncerts = np.array(uncerts)
+        for decimal in np.unique(decimals).tolist():
+            isDecimal = decimals == decimal
+            roundedValues[isDecimal] = np.around(values[isDecimal], decimal)
+            isDecimal &= hasUncert
+            roundedUncerts[isDecimal] = np.around(uncerts[isDecimal], decimal)
+
+        # values smaller than the uncertanty are printed as zero
+        roundedValues[hasUncert & ~isValueShown] = 0
 
-        return value, uncert
+        if self.len() == 1:
+            return roundedValues[0], roundedUncerts[0], decimals[0]
+        return roundedValues, roundedUncerts, decimals
+
+    def _printUncertanties(self, values, uncerts):
+        # returns the strings of the values and the uncertanties. The string of the uncertanty is None, if there is no uncertanty.
+        # The number of digits are determined for all datapoints at once
+        n = len(values)
+        valStr = [None] * n
+        uncStr = [None] * n
+
+        # values without an uncertanty are printed with nDigits significant digits
+        hasUncert, digitsUncert, isValueShown = variable._getDigits(values, uncerts)
+        for i in np.flatnonzero(~hasUncert).tolist():
+            valStr[i] = f'{values[i]:.{self.nDigits}g}'
+
+        index = np.flatnonzero(hasUncert)
+        values, uncerts, digitsUncert, isValueShown = values[index], uncerts[index], digitsUncert[index], isValueShown[index]
+
+        # uncertanties smaller than 1 are printed with a single significant digit
+        # and the value is printed with the same number of decimals
+        for i, u, v, d, shown in zip(index.tolist(), uncerts.tolist(), values.tolist(), digitsUncert.tolist(), isValueShown.tolist()):
+            if d > 0:
+                uncStr[i] = f'{u:.{1}g}'
+                valStr[i] = f'{v:.{d}f}' if shown else '0.' + '0' * d
+
+        # uncertanties larger than 1 are rounded to a single significant digit of the integer part
+        isLarge = digitsUncert <= 0
+        if np.any(isLarge):
+            uncerts, values, isValueShown, index = uncerts[isLarge], values[isLarge], isValueShown[isLarge], index[isLarge]
+            integers = np.abs(np.trunc(uncerts))
+            nDecimals = np.floor(np.log10(np.maximum(integers, 1))).astype(int) + 1
+            nDecimals += integers >= 10.0**nDecimals
+            nDecimals -= integers < 10.0**(nDecimals - 1)
+            nDecimals += uncerts < 0
+            roundedUncerts = np.zeros(len(uncerts))
+            roundedValues = np.zeros(len(values))
+            for nDecimal in np.unique(nDecimals).tolist():
+                isDecimal = nDecimals == nDecimal
+                roundedUncerts[isDecimal] = np.around(uncerts[isDecimal], -nDecimal + 1)
+                roundedValues[isDecimal] = np.around(values[isDecimal], -nDecimal + 1)
+            for i, u, v, shown in zip(index.tolist(), roundedUncerts.tolist(), roundedValues.tolist(), isValueShown.tolist()):
+                uncStr[i] = str(int(u))
+                valStr[i] = str(int(v)) if shown else '0'
+
+        return valStr, uncStr
 
     def __str__(self, pretty=None) -> str:
 
@@ -169,112 +376,281 @@ class variable():
                 return rf'{value} {pm} {uncert}{space}{unitStr}'
 
         else:
-            # print array of values
-            valStr = []
-            uncStr = []
-            for v, u in zip(self._value, self._uncert):
-                v, u = self.printUncertanty(v, u)
-                valStr.append(v)
-                uncStr.append(u)
-
-            if all(self._uncert == 0) or all(elem is None for elem in self._uncert):
-                out = rf''
-                out += rf'['
-                for i, elem in enumerate(valStr):
-                    out += rf'{elem}'
-                    if i != len(valStr) - 1:
-                        out += rf', '
-                out += rf']'
-                out += rf'{space}{unitStr}'
-                return out
+            # print array of values. Large arrays are summarized by the first and the last datapoints
+            values, uncerts = self._value, self._uncert
+            isSummary = not _printThreshold is None and self.len() > _printThreshold
+            if isSummary:
+                index = np.r_[0:_printEdgeItems, self.len() - _printEdgeItems:self.len()]
+                values, uncerts = values[index], uncerts[index]
+            valStr, uncStr = self._printUncertanties(np.asarray(values, dtype=float), np.asarray(uncerts, dtype=float))
+            if isSummary:
+                valStr.insert(_printEdgeItems, '...')
+                uncStr.insert(_printEdgeItems, '...')
+
+            if np.all(self._uncert == 0):
+                return rf'[{", ".join(valStr)}]{space}{unitStr}'
             else:
-                # find number of significant digits in uncertanty
-                out = rf''
-                out += rf'['
-                for i, elem in enumerate(valStr):
-                    out += rf'{elem}'
-                    if i != len(valStr) - 1:
-                        out += r', '
-                out += rf']'
-                out += rf' {pm} '
-                out += rf'['
-                for i, elem in enumerate(uncStr):
-                    out += rf'{elem}'
-                    if i != len(uncStr) - 1:
-                        out += r', '
-                out += rf']'
-                out += rf'{space}{unitStr}'
-                return out
+                return rf'[{", ".join(valStr)}] {pm} [{", ".join(map(str, uncStr))}]{space}{unitStr}'
+
+    @property
+    def dependsOn(self):
+        return {leaf: self._grad[i] for i, leaf in enumerate(self._leaves) if self._leafMaps[i] is None}
+
+    @staticmethod
+    def _getLeafKey(leaf, leafMap):
+        if leafMap is None:
+            return leaf
+        return (id(leaf), leafMap.tobytes())
 
     def _addDependents(self, vars, grads):
-        # copy the gradients
-        # this prevents a pointer error as the gradients often are set to the value of a variable
-        # when the gradients are scaled this causes problems
-        grads = [deepcopy(elem) for elem in grads]
+        # the leaves of self are extended in place
+        leaves = self._leaves
+        leafMaps = self._leafMaps
+        leafIndex = self._leafIndex
+        sparseGrad = {leaf: [sensitivities] for leaf, sensitivities in self._sparseGrad.items()}
+
+        def getRow(leaf, leafMap):
+            key = variable._getLeafKey(leaf, leafMap)
+            row = leafIndex.get(key)
+            if row is None:
+                row = len(leaves)
+                leafIndex[key] = row
+                leaves.append(leaf)
+                leafMaps.append(leafMap)
+            return row
 
         # loop over the variables and their gradients
+        blocks = []
+        selfScaleToSI = self._converterToSI.scale
         for var, grad in zip(vars, grads):
             # scale the gradient to SI units. This is necessary if one of the variables are converted after the dependency has been noted
-            scale = self._converterToSI.convert(1, useOffset=False) / var._converterToSI.convert(1, useOffset=False)
-            grad *= scale
-
-            # check if the variable depends on other variables
-            if var.dependsOn:
-
-                # loop over the dependencies of the variables and add them to the dependencies of self.
-                # this ensures that the product rule is used
-                for key, item in var.dependsOn.items():
-                    if key in self.dependsOn:
-                        self.dependsOn[key] += item * grad
-                    else:
-                        self.dependsOn[key] = item * grad
-            else:
-
-                # the variable did not have any dependecies. Therefore the the varaible is added to the dependencies of self
-                if var in self.dependsOn:
-                    self.dependsOn[var] += grad
-                else:
-                    self.dependsOn[var] = grad
+            grad = grad * (selfScaleToSI / var._converterToSI.scale)
+
+            if var._sparseGrad:
+                # the sensitivities of the reduced variable are scaled by the gradient at the datapoints of self
+                gradOfPoints = np.broadcast_to(grad, self.len())
+                for leaf, (points, leafPoints, g) in var._sparseGrad.items():
+                    if var.len() != self.len():
+                        # the variable has a single datapoint, which is used for all datapoints of self
+                        points = np.repeat(np.arange(self.len()), len(points))
+                        leafPoints = np.tile(leafPoints, self.len())
+                        g = np.tile(g, self.len())
+                    sparseGrad.setdefault(leaf, []).append((points, leafPoints, g * gradOfPoints[points]))
+
+            if var._leaves:
+                # the variable depends on other variables. The sensitivities of the variable are scaled by the gradient
+                # and added to the rows of the leaves of the variable. This ensures that the product rule is used
+                rows = []
+                for leaf, leafMap in zip(var._leaves, var._leafMaps):
+                    if not leafMap is None and len(leafMap) != self.len():
+                        # the variable has a single datapoint, which is used for all datapoints of self
+                        leafMap = np.full(self.len(), leafMap[0])
+                    rows.append(getRow(leaf, leafMap))
+                blocks.append((rows, var._grad * grad))
+            elif not var._sparseGrad:
+                # the variable did not have any dependecies. Therefore the the varaible is a leaf of self
+                blocks.append(([getRow(var, None)], grad))
+
+        # add the contributions from each variable to the array of the sensitivities
+        grad = self._getGradBuffer(len(leaves))
+        for rows, block in blocks:
+            grad[rows] += block
+
+        self._grad = grad
+        self._sparseGrad = {leaf: variable._sumSensitivities(entries, leaf.len()) if len(entries) > 1 else entries[0] for leaf, entries in sparseGrad.items()}
+
+    def _getGradBuffer(self, nRows):
+        # returns the array of the sensitivities with nRows rows. The rows of the existing leaves are kept.
+        # The array is a view of a buffer, which is grown by doubling the number of rows, when a variable,
+        # which already has sensitivities, gets new leaves. Therefore the sensitivities are not copied every time
+        # a variable is updated in place
+        if self._grad is None:
+            self._gradBuffer = np.zeros([nRows, self.len()])
+        elif self._gradBuffer is None or len(self._gradBuffer) < nRows:
+            buffer = np.zeros([max(nRows, 2 * len(self._grad)), self.len()])
+            buffer[0:len(self._grad)] = self._grad
+            self._gradBuffer = buffer
+        return self._gradBuffer[0:nRows]
+
+    @staticmethod
+    def _sumSensitivities(entries, stride):
+        # sums the sensitivities of the same pair of a datapoint of the variable and a datapoint of the leaf.
+        # The pairs are encoded as a single integer
+        points = np.concatenate([points for points, _, _ in entries])
+        leafPoints = np.concatenate([leafPoints for _, leafPoints, _ in entries])
+        keys, inverse = np.unique(points * stride + leafPoints, return_inverse=True)
+        grad = np.bincount(inverse, weights=np.concatenate([g for _, _, g in entries]), minlength=len(keys))
+        points, leafPoints = np.divmod(keys, stride)
+        return points, leafPoints, grad
+
+    def _getSensitivitiesOfLeaves(self):
+        # returns the sensitivities of each datapoint of self to each datapoint of the leaves in the same format as the sparse gradients
+        n = self.len()
+        points = np.arange(n)
+        if not self._leaves and not self._sparseGrad:
+            return {self: (points, points, np.ones(n))}
+
+        entries = {}
+        for i, (leaf, leafMap) in enumerate(zip(self._leaves, self._leafMaps)):
+            if leafMap is None:
+                leafMap = points if leaf.len() == n else np.zeros(n, dtype=int)
+            entries.setdefault(leaf, []).append((points, leafMap, self._grad[i]))
+        for leaf, sensitivities in self._sparseGrad.items():
+            entries.setdefault(leaf, []).append(sensitivities)
+        return {leaf: variable._sumSensitivities(e, leaf.len()) if len(e) > 1 else e[0] for leaf, e in entries.items()}
+
+    @staticmethod
+    def _assertCorrelation(var_i, var_j):
+        if not var_i in var_j.covariance:
+            logger.error(
+                f'The variable {var_i} is correlated with the varaible {var_j}. However the variable {var_j} not not correlated with the variable {var_i}. Something is wrong.')
+            raise ValueError(
+                f'The variable {var_i} is correlated with the varaible {var_j}. However the variable {var_j} not not correlated with the variable {var_i}. Something is wrong.')
 
     def _addCovariance(self, var, covariance):
         self.covariance[var] = covariance
 
     def _calculateUncertanty(self):
+        if _lazyUncertanty:
+            # the uncertanty is calculated the first time it is needed
+            self._uncertIsStale = True
+            return
+        self._evaluateUncertanty()
+
+    def _evaluateUncertanty(self):
+        # the variable is marked as up to date before the evaluation.
+        # A variable, which is one of its own leaves (see solve), then uses its current uncertanty
+        self._uncertIsStale = False
 
         # variance from each measurement
         if self.len() == 0:
             variance = 0
         else:
             variance = np.zeros(self.len())
-        selfScaleToSI = self._converterToSI.convert(1, useOffset=False)
-        for var, grad in self.dependsOn.items():
-            # the gradient is scaled with the inverse of the conversion of the unit to SI units.
-            # This is necessary if the variable "var" has been converted after the dependency has been noted
-            scale = var._converterToSI.convert(1, useOffset=False) / selfScaleToSI
-            variance += (grad * scale * var.uncert)**2
 
-        # variance from the corralation between measurements
-        n = len(self.dependsOn.keys())
-        for i in range(n):
-            var_i = list(self.dependsOn.keys())[i]
-            for j in range(i + 1, n):
-                var_j = list(self.dependsOn.keys())[j]
-                if var_j in var_i.covariance.keys():
-                    if not var_i in var_j.covariance.keys():
-                        logger.error(
-                            f'The variable {var_i} is correlated with the varaible {var_j}. However the variable {var_j} not not correlated with the variable {var_i}. Something is wrong.')
-                        raise ValueError(
-                            f'The variable {var_i} is correlated with the varaible {var_j}. However the variable {var_j} not not correlated with the variable {var_i}. Something is wrong.')
-                    scale_i = var_i._converterToSI.convert(1, useOffset=False) / selfScaleToSI
-                    scale_j = var_j._converterToSI.convert(1, useOffset=False) / selfScaleToSI
-                    varianceContribution = 2 * scale_i * self.dependsOn[var_i] * scale_j * self.dependsOn[var_j] * var_i.covariance[var_j][0]
-                    variance += varianceContribution
+        if self._sparseGrad or any(not leafMap is None for leafMap in self._leafMaps):
+            # the datapoints of self depend on other datapoints of the leaves
+            variance = variance + self._getSparseVariance()
+        elif self._leaves:
+            # the gradients are scaled with the inverse of the conversion of the unit to SI units.
+            # This is necessary if the leaves have been converted after the dependency has been noted
+            selfScaleToSI = self._converterToSI.scale
+            scales = np.array([leaf._converterToSI.scale for leaf in self._leaves]) / selfScaleToSI
+            grad = self._grad * scales[:, np.newaxis]
+
+            # stack the uncertanty of the leaves
+            uncert = np.empty(grad.shape)
+            for i, leaf in enumerate(self._leaves):
+                uncert[i] = leaf._uncert
+            variance = variance + np.sum((grad * uncert)**2, axis=0)
+
+            # variance from the corralation between measurements
+            pairs = []
+            for i, var_i in enumerate(self._leaves):
+                for var_j, covariance in var_i.covariance.items():
+                    j = self._leafIndex.get(var_j)
+                    if j is None:
+                        continue
+                    variable._assertCorrelation(var_i, var_j)
+                    if i < j:
+                        pairs.append((i, j, covariance))
+
+            if pairs:
+                # the contribution of the correlated leaves is the sum of 2 * g_i * g_j * covariance_ij over the correlated pairs.
+                # Only the pairs with a covariance are used, as the covariance is symmetric and zero for the other pairs
+                rows_i = [i for i, _, _ in pairs]
+                rows_j = [j for _, j, _ in pairs]
+                covariance = np.array([np.broadcast_to(np.asarray(cov, dtype=float), self.len()) for _, _, cov in pairs])
+                variance = variance + 2 * np.einsum('pn,pn,pn->n', grad[rows_i], grad[rows_j], covariance)
 
         self._uncert = np.sqrt(variance)
-        logger.info(f'Calculated uncertanty to {self._uncert}')
+        logger.info('Calculated uncertanty to %s', self._uncert)
+
+    def _getSparseVariance(self):
+        # the variance is summed for each pair of a datapoint of self and a datapoint of a leaf
+        n = self.len()
+        selfScaleToSI = self._converterToSI.scale
+        sensitivities = self._getSensitivitiesOfLeaves()
+
+        variance = np.zeros(n)
+        for leaf, (points, leafPoints, g) in sensitivities.items():
+            g = g * (leaf._converterToSI.scale / selfScaleToSI)
+            variance += np.bincount(points, weights=(g * leaf._uncert[leafPoints])**2, minlength=n)
+
+        # variance from the corralation between measurements. Only the same datapoints of two measurements are correlated
+        stride = max(leaf.len() for leaf in sensitivities)
+        order = {leaf: i for i, leaf in enumerate(sensitivities)}
+        for var_i, (points, leafPoints, g_i) in sensitivities.items():
+            for var_j, covariance in var_i.covariance.items():
+                if not var_j in sensitivities:
+                    continue
+                variable._assertCorrelation(var_i, var_j)
+                if order[var_i] < order[var_j]:
+                    points_j, leafPoints_j, g_j = sensitivities[var_j]
+                    _, index_i, index_j = np.intersect1d(points * stride + leafPoints, points_j * stride + leafPoints_j, assume_unique=True, return_indices=True)
+                    covariance = np.broadcast_to(np.asarray(covariance, dtype=float), var_i.len())
+                    scale = var_i._converterToSI.scale * var_j._converterToSI.scale / selfScaleToSI**2
+                    contribution = 2 * scale * g_i[index_i] * g_j[index_j] * covariance[leafPoints[index_i]]
+                    variance += np.bincount(points[index_i], weights=contribution, minlength=n)
+
+        return variance
+
+    def _getCumulativeVariance(self):
+        # returns the variance of the cumulative sum of self. The sensitivity of the cumulative sum at a datapoint to a datapoint
+        # of a leaf is the cumulative sum of the sensitivities of self. These are summed for all datapoints of a leaf at once
+        n = self.len()
+        selfScaleToSI = self._converterToSI.scale
+        sensitivities = self._getSensitivitiesOfLeaves()
+
+        def cumulative(points, leafPoints, *grads):
+            # sorts the sensitivities by the datapoint of the leaf and then by the datapoint of self.
+            # Returns the cumulative sums of the gradients for each datapoint of the leaf
+            order = np.lexsort((points, leafPoints))
+            points, leafPoints = points[order], leafPoints[order]
+            first = np.ones(len(points), dtype=bool)
+            first[1:] = leafPoints[1:] != leafPoints[:-1]
+            start = np.flatnonzero(first)
+            counts = np.diff(np.append(start, len(points)))
+            out = []
+            for g in grads:
+                g = g[order]
+                c = np.cumsum(g)
+                out.append(c - np.repeat(c[start] - g[start], counts))
+            return points, leafPoints, first, out
+
+        increments = np.zeros(n)
+        for leaf, (points, leafPoints, g) in sensitivities.items():
+            g = g * (leaf._converterToSI.scale / selfScaleToSI)
+            points, leafPoints, first, (G,) = cumulative(points, leafPoints, g)
+            previous = np.where(first, 0, np.roll(G, 1))
+            increments += np.bincount(points, weights=(G**2 - previous**2) * leaf._uncert[leafPoints]**2, minlength=n)
+
+        # variance from the corralation between measurements
+        order = {leaf: i for i, leaf in enumerate(sensitivities)}
+        for var_i, (points_i, leafPoints_i, g_i) in sensitivities.items():
+            for var_j, covariance in var_i.covariance.items():
+                if not var_j in sensitivities:
+                    continue
+                variable._assertCorrelation(var_i, var_j)
+                if order[var_i] < order[var_j]:
+                    points_j, leafPoints_j, g_j = sensitivities[var_j]
+                    g_i = g_i * (var_i._converterToSI.scale / selfScaleToSI)
+                    g_j = g_j * (var_j._converterToSI.scale / selfScaleToSI)
+                    points, leafPoints, first, (G_i, G_j) = cumulative(
+                        np.concatenate([points_i, points_j]),
+                        np.concatenate([leafPoints_i, leafPoints_j]),
+                        np.concatenate([g_i, np.zeros(len(g_j))]),
+                        np.concatenate([np.zeros(len(g_i)), g_j])
+                    )
+                    product = G_i * G_j
+                    previous = np.where(first, 0, np.roll(product, 1))
+                    covariance = np.broadcast_to(np.asarray(covariance, dtype=float), var_i.len())
+                    increments += np.bincount(points, weights=2 * (product - previous) * covariance[leafPoints], minlength=n)
+
+        return np.cumsum(increments)
 
     def __add__(self, other):
-        logger.info(f'Adding together {self} and {other}')
+        logger.info('Adding together %s and %s', self, other)
 
         if not isinstance(other, variable):
             return self + variable(other, self.unit)
@@ -285,33 +661,27 @@ class variable():
             logger.error(f'You tried to add a variable in [{self.unit}] to a variable in [{other.unit}], but the units do not have the same SI base unit')
             raise ValueError(f'You tried to add a variable in [{self.unit}] to a variable in [{other.unit}], but the units do not have the same SI base unit')
 
-        # convert self and other to the SI unit system
-        selfUnit = deepcopy(self.unit)
-        otherUnit = deepcopy(other.unit)
-        self.convert(self._unitObject._SIBaseUnit)
-        other.convert(other._unitObject._SIBaseUnit)
+        # determine the values of self and other in the SI unit system without converting the variables
+        selfValue, selfScale = self._getValueInSI()
+        otherValue, otherScale = other._getValueInSI()
 
         # determine the value and gradients
-        val = self._value + other._value
-        grad = [1, 1]
+        val = selfValue + otherValue
+        grad = [selfScale, otherScale]
         vars = [self, other]
 
         # create the new variable
-        var = variable(val, outputUnit)
+        var = variable._fromArrays(val, unit(outputUnit))
         var._addDependents(vars, grad)
         var._calculateUncertanty()
 
-        # convert self and other back
-        self.convert(selfUnit)
-        other.convert(otherUnit)
-
         # convert the output variable
         if outputUnit == 'K':
             SIBaseUnits = [self._unitObject._SIBaseUnit, other._unitObject._SIBaseUnit]
             if 'DELTAK' in SIBaseUnits:
                 outputUnit = [self.unit, other.unit][SIBaseUnits.index('K')]
                 var.convert(outputUnit)
-        if self.unit == other.unit:
+        if self.unit == other.unit and var.unit != self.unit:
             var.convert(self.unit)
         return var
 
@@ -319,7 +689,7 @@ class variable():
         return self + other
 
     def __sub__(self, other):
-        logger.info(f'Subtracting {other} from {self}')
+        logger.info('Subtracting %s from %s', other, self)
 
         if not isinstance(other, variable):
             return self - variable(other, self.unit)
@@ -330,33 +700,27 @@ class variable():
             logger.error(f'You tried to subtract a variable in [{other.unit}] from a variable in [{self.unit}], but the units do not have the same SI base unit')
             raise ValueError(f'You tried to subtract a variable in [{other.unit}] from a variable in [{self.unit}], but the units do not have the same SI base unit')
 
-        # convert self and other to the SI unit system
-        selfUnit = deepcopy(self.unit)
-        otherUnit = deepcopy(other.unit)
-        self.convert(self._unitObject._SIBaseUnit)
-        other.convert(other._unitObject._SIBaseUnit)
+        # determine the values of self and other in the SI unit system without converting the variables
+        selfValue, selfScale = self._getValueInSI()
+        otherValue, otherScale = other._getValueInSI()
 
         # determine the value and gradients
-        val = self.value - other.value
-        grad = [1, -1]
+        val = selfValue - otherValue
+        grad = [selfScale, -otherScale]
         vars = [self, other]
 
         # create the new variable
-        var = variable(val, outputUnit)
+        var = variable._fromArrays(val, unit(outputUnit))
         var._addDependents(vars, grad)
         var._calculateUncertanty()
 
-        # convert self and other back
-        self.convert(selfUnit)
-        other.convert(otherUnit)
-
         # convert the output variable
         if outputUnit == 'K':
             SIBaseUnits = [self._unitObject._SIBaseUnit, other._unitObject._SIBaseUnit]
             if 'DELTAK' in SIBaseUnits:
                 outputUnit = [self.unit, other.unit][SIBaseUnits.index('K')]
                 var.convert(outputUnit)
-        if self.unit == other.unit and 'DELTA' not in outputUnit:
+        if self.unit == other.unit and 'DELTA' not in outputUnit and var.unit != self.unit:
             var.convert(self.unit)
 
         return var
@@ -365,18 +729,18 @@ class variable():
         return - self + other
 
     def __mul__(self, other):
-        logger.info(f'Multiplying {self} and {other}')
+        logger.info('Multiplying %s and %s', self, other)
 
         if not isinstance(other, variable):
             return self * variable(other)
 
-        val = self.value * other.value
+        val = self._value * other._value
         outputUnit = self._unitObject * other._unitObject
 
         grad = [other._value, self._value]
         vars = [self, other]
 
-        var = variable(val, outputUnit)
+        var = variable._fromArrays(val, unit(outputUnit))
         var._addDependents(vars, grad)
         var._calculateUncertanty()
 
@@ -389,7 +753,7 @@ class variable():
         return self * other
 
     def __pow__(self, other):
-        logger.info(f'Raising {self} to the power of {other}')
+        logger.info('Raising %s to the power of %s', self, other)
 
         if not isinstance(other, variable):
             return self ** variable(other)
@@ -401,21 +765,32 @@ class variable():
             logger.error('The exponent can not have a unit')
             raise ValueError('The exponent can not have a unit')
 
-        val = self._value ** other.value
+        power = other._value[0]
         outputUnit = self._unitObject ** other.value
 
-        gradSelf = other._value * self._value ** (other._value - 1)
-        def gradOther(valSelf, valOther, uncertOther):
-            if uncertOther != 0:
-                return valSelf ** valOther * np.log(valSelf)
-            else:
-                return 0
-        gradOther = np.vectorize(gradOther, otypes=[float])(self._value, other._value, other._uncert)
+        # the common constant exponents are evaluated without the general power function
+        if power == 2:
+            val = self._value * self._value
+            gradSelf = 2 * self._value
+        elif power == 0.5:
+            val = np.sqrt(self._value)
+            gradSelf = 0.5 / val
+        elif power == -1:
+            val = 1 / self._value
+            gradSelf = -val * val
+        else:
+            val = self._value ** power
+            gradSelf = power * self._value ** (power - 1)
 
-        grad = [gradSelf, gradOther]
-        vars = [self, other]
+        grad = [gradSelf]
+        vars = [self]
+
+        # the exponent only contributes to the uncertanty if it is uncertain
+        if other._uncert[0] != 0:
+            grad.append(val * np.log(self._value))
+            vars.append(other)
 
-        var = variable(val, outputUnit)
+        var = variable._fromArrays(val, unit(outputUnit))
         var._addDependents(vars, grad)
         var._calculateUncertanty()
         return var
@@ -424,7 +799,7 @@ class variable():
         return variable(other, '1') ** self
 
     def __truediv__(self, other):
-        logger.info(f'Dividing {self} with {other}')
+        logger.info('Dividing %s with %s', self, other)
         if not isinstance(other, variable):
             return self / variable(other)
 
@@ -434,7 +809,7 @@ class variable():
         grad = [1 / other._value, -self._value / (other._value**2)]
         vars = [self, other]
 
-        var = variable(val, outputUnit)
+        var = variable._fromArrays(val, unit(outputUnit))
         var._addDependents(vars, grad)
         var._calculateUncertanty()
 
@@ -444,7 +819,7 @@ class variable():
         return var
 
     def __rtruediv__(self, other):
-        logger.info(f'Dividing {other} with {self}')
+        logger.info('Dividing %s with %s', other, self)
         if not isinstance(other, variable):
             return variable(other) / self
 
@@ -454,7 +829,7 @@ class variable():
         grad = [-other._value / (self._value**2), 1 / (self._value)]
         vars = [self, other]
 
-        var = variable(val, outputUnit)
+        var = variable._fromArrays(val, unit(outputUnit))
         var._addDependents(vars, grad)
         var._calculateUncertanty()
 
@@ -463,49 +838,167 @@ class variable():
 
         return var
 
+    def _canUpdateInPlace(self, other):
+        # a variable without any dependencies might be a leaf of other variables. Changing the variable
+        # would change the uncertanty of these variables. Therefore only variables, which depend on other variables, are updated in place
+        if not self._leaves and not self._sparseGrad:
+            return False
+        return not other is self and other.len() in [1, self.len()]
+
+    def _updateInPlace(self, value, outputUnit, gradSelf, vars, grads):
+        # the sensitivities of self are scaled by the gradient of the new value with respect to the old value.
+        # The sensitivities of the other variables are then added to the sensitivities of self
+        if not outputUnit is None:
+            unitObject = unit(outputUnit)
+            factor = np.broadcast_to(gradSelf * (unitObject._converterToSI.scale / self._converterToSI.scale), self.len())
+            if not self._grad is None:
+                self._grad *= factor
+            self._sparseGrad = {leaf: (points, leafPoints, g * factor[points]) for leaf, (points, leafPoints, g) in self._sparseGrad.items()}
+            self._unitObject = unitObject
+            self._getConverterToSI()
+
+        # the values are not changed in place, as the values of a slice of the variable is a view of the values
+        self._value = value
+        self._addDependents(vars, grads)
+        self._calculateUncertanty()
+
+    def _toUnit(self, other):
+        # converts other to the unit of self
+        if other.unit != self.unit:
+            other.convert(self.unit)
+        return other
+
+    def __iadd__(self, other):
+        if not isinstance(other, variable):
+            other = variable(other, self.unit)
+
+        # temperatures are added as differences, which might change the unit of the result
+        SIBaseUnit = self._unitObject._SIBaseUnit
+        if SIBaseUnit != other._unitObject._SIBaseUnit or SIBaseUnit in ['K', 'DELTAK']:
+            return self + other
+        if not self._canUpdateInPlace(other):
+            # the unit of the variable is kept as if the variable was updated in place
+            return self._toUnit(self + other)
+
+        logger.info('Adding %s to %s in place', other, self)
+        scale = other._unitObject.getConverter(self.unit).scale
+        self._updateInPlace(self._value + scale * other._value, None, 1, [other], [scale])
+        return self
+
+    def __isub__(self, other):
+        if not isinstance(other, variable):
+            other = variable(other, self.unit)
+
+        # temperatures are subtracted as differences, which might change the unit of the result
+        SIBaseUnit = self._unitObject._SIBaseUnit
+        if SIBaseUnit != other._unitObject._SIBaseUnit or SIBaseUnit in ['K', 'DELTAK']:
+            return self - other
+        if not self._canUpdateInPlace(other):
+            # the unit of the variable is kept as if the variable was updated in place
+            return self._toUnit(self - other)
+
+        logger.info('Subtracting %s from %s in place', other, self)
+        scale = other._unitObject.getConverter(self.unit).scale
+        self._updateInPlace(self._value - scale * other._value, None, 1, [other], [-scale])
+        return self
+
+    def __imul__(self, other):
+        if not isinstance(other, variable):
+            other = variable(other)
+        if not self._canUpdateInPlace(other):
+            return self * other
+
+        logger.info('Multiplying %s with %s in place', self, other)
+        outputUnit = self._unitObject * other._unitObject
+        self._updateInPlace(self._value * other._value, outputUnit, other._value, [other], [self._value])
+
+        if self._unitObject._SIBaseUnit == '1' and self._unitObject != '1':
+            self.convert('1')
+        return self
+
+    def __itruediv__(self, other):
+        if not isinstance(other, variable):
+            other = variable(other)
+        if not self._canUpdateInPlace(other):
+            return self / other
+
+        logger.info('Dividing %s with %s in place', self, other)
+        outputUnit = self._unitObject / other._unitObject
+        self._updateInPlace(self._value / other._value, outputUnit, 1 / other._value, [other], [-self._value / (other._value**2)])
+
+        if self._unitObject._SIBaseUnit == '1' and self._unitObject != '1':
+            self.convert('1')
+        return self
+
     def __neg__(self):
-        logger.info(f'Negating {self}')
+        logger.info('Negating %s', self)
         return -1 * self
 
     def log(self):
-        logger.info(f'Taking the natural log of {self}')
+        logger.info('Taking the natural log of %s', self)
         if self.unit != '1':
             logger.error('You can only take the natural log of a variable if it has no unit')
             raise ValueError('You can only take the natural log of a variable if it has no unit')
 
-        val = np.log(self.value)
+        val = np.log(self._value)
 
         vars = [self]
-        grad = [1 / self.value]
+        grad = [1 / self._value]
 
-        var = variable(val, '1')
+        var = variable._fromArrays(val, unit('1'))
         var._addDependents(vars, grad)
         var._calculateUncertanty()
 
         return var
 
     def log10(self):
-        logger.info(f'Taking the base 10 log of {self}')
+        logger.info('Taking the base 10 log of %s', self)
 
         if self.unit != '1':
             logger.error('You can only take the base 10 log of a variable if it has no unit')
             raise ValueError('You can only take the base 10 log of a variable if it has no unit')
-        val = np.log10(self.value)
+        val = np.log10(self._value)
 
         vars = [self]
-        grad = [1 / (self.value * np.log10(self.value))]
+        grad = [1 / (self._value * np.log(10))]
 
-        var = variable(val, '1')
+        var = variable._fromArrays(val, unit('1'))
         var._addDependents(vars, grad)
         var._calculateUncertanty()
 
         return var
 
     def exp(self):
-        return np.e**self
+        logger.info('Taking the exponential of %s', self)
+        if self.unit != '1':
+            logger.error('The exponent can not have a unit')
+            raise ValueError('The exponent can not have a unit')
+
+        val = np.exp(self._value)
+
+        vars = [self]
+        grad = [val]
+
+        var = variable._fromArrays(val, unit('1'))
+        var._addDependents(vars, grad)
+        var._calculateUncertanty()
+
+        return var
 
     def sqrt(self):
-        return self**(1 / 2)
+        logger.info('Taking the square root of %s', self)
+
+        outputUnit = self._unitObject ** 0.5
+        val = np.sqrt(self._value)
+
+        vars = [self]
+        grad = [0.5 / val]
+
+        var = variable._fromArrays(val, unit(outputUnit))
+        var._addDependents(vars, grad)
+        var._calculateUncertanty()
+
+        return var
 
     def sin(self):
         if str(self._unitObject._SIBaseUnit) != 'rad':
@@ -514,15 +1007,15 @@ class variable():
 
         outputUnit = '1'
         if self._unitObject._assertEqual('rad'):
-            val = np.sin(self.value)
-            grad = [np.cos(self.value)]
+            val = np.sin(self._value)
+            grad = [np.cos(self._value)]
         else:
-            val = np.sin(np.pi / 180 * self.value)
-            grad = [np.pi / 180 * np.cos(np.pi / 180 * self.value)]
+            val = np.sin(np.pi / 180 * self._value)
+            grad = [np.pi / 180 * np.cos(np.pi / 180 * self._value)]
 
         vars = [self]
 
-        var = variable(val, outputUnit)
+        var = variable._fromArrays(val, unit(outputUnit))
         var._addDependents(vars, grad)
         var._calculateUncertanty()
 
@@ -535,15 +1028,15 @@ class variable():
 
         outputUnit = '1'
         if self.unit == 'rad':
-            val = np.cos(self.value)
-            grad = [-np.sin(self.value)]
+            val = np.cos(self._value)
+            grad = [-np.sin(self._value)]
         else:
-            val = np.cos(np.pi / 180 * self.value)
-            grad = [-np.pi / 180 * np.sin(np.pi / 180 * self.value)]
+            val = np.cos(np.pi / 180 * self._value)
+            grad = [-np.pi / 180 * np.sin(np.pi / 180 * self._value)]
 
         vars = [self]
 
-        var = variable(val, outputUnit)
+        var = variable._fromArrays(val, unit(outputUnit))
         var._addDependents(vars, grad)
         var._calculateUncertanty()
 
@@ -556,29 +1049,59 @@ class variable():
 
         outputUnit = '1'
         if self.unit == 'rad':
-            val = np.tan(self.value)
-            grad = [2 / (np.cos(2 * self.value) + 1)]
+            val = np.tan(self._value)
+            grad = [2 / (np.cos(2 * self._value) + 1)]
         else:
-            val = np.tan(np.pi / 180 * self.value)
-            grad = [np.pi / (90 * (np.cos(np.pi / 90 * self.value) + 1))]
+            val = np.tan(np.pi / 180 * self._value)
+            grad = [np.pi / (90 * (np.cos(np.pi / 90 * self._value) + 1))]
 
         vars = [self]
 
-        var = variable(val, outputUnit)
+        var = variable._fromArrays(val, unit(outputUnit))
         var._addDependents(vars, grad)
         var._calculateUncertanty()
 
         return var
 
     def __abs__(self):
-        return variable(np.abs(self.value), self.unit, self.uncert)
+        logger.info('Taking the absolute value of %s', self)
+
+        val = np.abs(self._value)
+
+        # the gradient is 1 at zero, such that the uncertanty of the absolute value of zero is the uncertanty of the variable
+        vars = [self]
+        grad = [np.where(self._value < 0, -1.0, 1.0)]
+
+        var = variable._fromArrays(val, unit(self.unit))
+        var._addDependents(vars, grad)
+        var._calculateUncertanty()
+
+        return var
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != '__call__' or kwargs:
+            return NotImplemented
+
+        # unary functions are evaluated by the methods of the variable
+        if ufunc in HANDLED_UFUNCS:
+            return getattr(inputs[0], HANDLED_UFUNCS[ufunc])()
+
+        # binary functions are evaluated by the operator of the variable. The reflected operator is used if the first input is not a variable
+        if ufunc in HANDLED_BINARY_UFUNCS:
+            a, b = inputs
+            operator, reflectedOperator = HANDLED_BINARY_UFUNCS[ufunc]
+            if isinstance(a, variable):
+                return getattr(a, operator)(b)
+            return getattr(b, reflectedOperator)(a)
+
+        return NotImplemented
 
     def __array_function__(self, func, types, args, kwargs):
         if func not in HANDLED_FUNCTIONS:
             return NotImplemented
         # Note: this allows subclasses that don't override
         # __array_function__ to handle Physical objects
-        if not all(issubclass(t, variable) for t in types):
+        if not all(issubclass(t, (variable, np.ndarray)) for t in types):
             return NotImplemented
         return HANDLED_FUNCTIONS[func](*args, **kwargs)
 
@@ -587,166 +1110,39 @@ class variable():
         if self.len() != other.len():
             raise ValueError(f'You cannot compare {self} and {other} as they do not have the same length')
 
-    def __lt__(self, other):
+    def _compare(self, other, operator):
         if not isinstance(other, variable):
-            return self < variable(other, self.unit)
+            other = variable(other, self.unit)
 
-        if not self._unitObject._SIBaseUnit == other._unitObject._SIBaseUnit:
+        if not self._unitObject._dimension == other._unitObject._dimension:
             raise ValueError(f'You cannot compare {self} and {other} as they do not have the same SI base unit')
-        
-        selfUnit = deepcopy(self.unit)
-        otherUnit = deepcopy(other.unit)
-        
-        self.convert(self._unitObject._SIBaseUnit)
-        other.convert(self._unitObject._SIBaseUnit)
 
-        if self.len() == 1 and other.len() == 1:
-            out =  self.value < other.value
-        elif self.len() == 1:
-            out = list(self.value < other.value)
-        elif other.len() == 1:
-            out = list(self.value < other.value)
-        else:
+        if self.len() != 1 and other.len() != 1:
             self._compareLengths(other)
-            out = [elemA < elemB for elemA, elemB in zip(self.value, other.value)]
-        
-        self.convert(selfUnit)
-        other.convert(otherUnit)
-        return out
 
-    def __le__(self, other):
-        if not isinstance(other, variable):
-            return self <= variable(other, self.unit)
-        if not self._unitObject._SIBaseUnit == other._unitObject._SIBaseUnit:
-            raise ValueError(f'You cannot compare {self} and {other} as they do not have the same SI base unit')
-        
-        selfUnit = deepcopy(self.unit)
-        otherUnit = deepcopy(other.unit)
-        
-        self.convert(self._unitObject._SIBaseUnit)
-        other.convert(self._unitObject._SIBaseUnit)
-        
+        # the values are compared in the SI unit system without converting the variables
+        out = operator(self._getValueInSI()[0], other._getValueInSI()[0])
         if self.len() == 1 and other.len() == 1:
-            out = self.value <= other.value
-        elif self.len() == 1:
-            out = list(self.value <= other.value)
-        elif other.len() == 1:
-            out = list(self.value <= other.value)
-        else:
-            self._compareLengths(other)
-            out = [elemA <= elemB for elemA, elemB in zip(self.value, other.value)]
-
-        self.convert(selfUnit)
-        other.convert(otherUnit)
+            return out[0]
         return out
-    
-    def __gt__(self, other):
-        if not isinstance(other, variable):
-            return self > variable(other, self.unit)
 
-        if not self._unitObject._SIBaseUnit == other._unitObject._SIBaseUnit:
-            raise ValueError(f'You cannot compare {self} and {other} as they do not have the same SI base unit')
-        
-        selfUnit = deepcopy(self.unit)
-        otherUnit = deepcopy(other.unit)
-        
-        self.convert(self._unitObject._SIBaseUnit)
-        other.convert(self._unitObject._SIBaseUnit)
-
-        if self.len() == 1 and other.len() == 1:
-            out =  self.value > other.value
-        elif self.len() == 1:
-            out =  list(self.value > other.value)
-        elif other.len() == 1:
-            out =  list(self.value > other.value)
-        else:
-            self._compareLengths(other)
-            out =  [elemA > elemB for elemA, elemB in zip(self.value, other.value)]
-        
-        self.convert(selfUnit)
-        other.convert(otherUnit)
-        return out
-   
-    def __ge__(self, other):
-        if not isinstance(other, variable):
-            return self >= variable(other, self.unit)
+    def __lt__(self, other):
+        return self._compare(other, np.less)
 
-        if not self._unitObject._SIBaseUnit == other._unitObject._SIBaseUnit:
-            raise ValueError(f'You cannot compare {self} and {other} as they do not have the same SI base unit')
-        
-        selfUnit = deepcopy(self.unit)
-        otherUnit = deepcopy(other.unit)
-        
-        self.convert(self._unitObject._SIBaseUnit)
-        other.convert(self._unitObject._SIBaseUnit)
+    def __le__(self, other):
+        return self._compare(other, np.less_equal)
 
-        if self.len() == 1 and other.len() == 1:
-            out =  self.value >= other.value
-        elif self.len() == 1:
-            out =  list(self.value >= other.value)
-        elif other.len() == 1:
-            out =  list(self.value >= other.value)
-        else:
-            self._compareLengths(other)
-            out =  [elemA >= elemB for elemA, elemB in zip(self.value, other.value)]
+    def __gt__(self, other):
+        return self._compare(other, np.greater)
 
-        self.convert(selfUnit)
-        other.convert(otherUnit)
-        return out
+    def __ge__(self, other):
+        return self._compare(other, np.greater_equal)
 
     def __eq__(self, other):
-        if not isinstance(other, variable):
-            return self == variable(other, self.unit)
-
-        if not self._unitObject._SIBaseUnit == other._unitObject._SIBaseUnit:
-            raise ValueError(f'You cannot compare {self} and {other} as they do not have the same SI base unit')
-        
-        selfUnit = deepcopy(self.unit)
-        otherUnit = deepcopy(other.unit)
-        
-        self.convert(self._unitObject._SIBaseUnit)
-        other.convert(self._unitObject._SIBaseUnit)
-
-        if self.len() == 1 and other.len() == 1:
-            out =  self.value == other.value
-        elif self.len() == 1:
-            out =  list(self.value == other.value)
-        elif other.len() == 1:
-            out =  list(self.value == other.value)
-        else:
-            self._compareLengths(other)
-            out =  [elemA == elemB for elemA, elemB in zip(self.value, other.value)]
-
-        self.convert(selfUnit)
-        other.convert(otherUnit)
-        return out
+        return self._compare(other, np.equal)
 
     def __ne__(self, other):
-        if not isinstance(other, variable):
-            return self != variable(other, self.unit)
-
-        if not self._unitObject._SIBaseUnit == other._unitObject._SIBaseUnit:
-            raise ValueError(f'You cannot compare {self} and {other} as they do not have the same SI base unit')
-        
-        selfUnit = deepcopy(self.unit)
-        otherUnit = deepcopy(other.unit)
-        
-        self.convert(self._unitObject._SIBaseUnit)
-        other.convert(self._unitObject._SIBaseUnit)
-
-        if self.len() == 1 and other.len() == 1:
-            out = self.value != other.value
-        elif self.len() == 1:
-            out = list(self.value != other.value)
-        elif other.len() == 1:
-            out = list(self.value != other.value)
-        else:
-            self._compareLengths(other)
-            out = [elemA != elemB for elemA, elemB in zip(self.value, other.value)]
-
-        self.convert(selfUnit)
-        other.convert(otherUnit)
-        return out
+        return self._compare(other, np.not_equal)
 
     def __hash__(self):
         return id(self)
@@ -796,22 +1192,94 @@ def np_max_for_variable(x, *args, **kwargs):
     return variable(val, x.unit, unc)
 
 
-@implements(np.mean)
-def np_mean_for_variable(x, *args, **kwargs):
-    if x.len() > 1:
-        val = np.mean(x.value)
-        if not x.uncert is None:
-            n = len(x.uncert)
-            unc = np.sqrt(sum([(1 / n * elem)**2 for elem in x.uncert]))
-        else:
-            unc = None
-    else:
-        val = x.value
-        if not x.uncert is None:
-            unc = x.uncert
-        else:
-            unc = None
-    return variable(val, x.unit, unc)
+def _reduce(x, value, weights):
+    # returns a variable with a single datapoint. The sensitivity of the datapoint to each datapoint of x is given by the weights
+    var = variable._fromArrays(np.array([value], dtype=float), unit(x.unit))
+    weights = np.broadcast_to(weights, x.len())
+    sparseGrad = {}
+    for leaf, (points, leafPoints, g) in x._getSensitivitiesOfLeaves().items():
+        sparseGrad[leaf] = variable._sumSensitivities([(np.zeros(len(points), dtype=int), leafPoints, g * weights[points])], leaf.len())
+    var._sparseGrad = sparseGrad
+    var._calculateUncertanty()
+    return var
 
 
+@implements(np.sum)
+def np_sum_for_variable(x, *args, **kwargs):
+    return _reduce(x, np.sum(x._value), 1)
 
+
+@implements(np.mean)
+def np_mean_for_variable(x, *args, **kwargs):
+    return _reduce(x, np.mean(x._value), 1 / x.len())
+
+
+@implements(np.average)
+def np_average_for_variable(x, *args, weights=None, **kwargs):
+    if weights is None:
+        return np.mean(x)
+    if isinstance(weights, variable):
+        logger.error('The weights of the average has to be numbers')
+        raise ValueError('The weights of the average has to be numbers')
+    weights = np.broadcast_to(np.asarray(weights, dtype=float), x.len())
+    weights = weights / np.sum(weights)
+    return _reduce(x, np.sum(weights * x._value), weights)
+
+
+@implements(np.std)
+def np_std_for_variable(x, *args, ddof=0, **kwargs):
+    deviation = x._value - np.mean(x._value)
+    val = np.sqrt(np.sum(deviation**2) / (x.len() - ddof))
+    if val == 0:
+        weights = 0
+    else:
+        weights = deviation / ((x.len() - ddof) * val)
+    return _reduce(x, val, weights)
+
+
+# the largest number of sensitivities of a cumulative sum. The cumulative sum at a datapoint depends on all previous datapoints.
+# A larger cumulative sum is returned as a new measurement, which is not correlated with the leaves of x
+_maxCumulativeSensitivities = 10**7
+
+
+def _cumulativeSensitivities(points, leafPoints, g, n):
+    # the cumulative sum at the datapoint p depends on the datapoint l of a leaf with the sum of the sensitivities of the
+    # datapoints q <= p to l. The sums are found for each datapoint of the leaf by sorting the sensitivities by the datapoint of the leaf.
+    # Each sum is used for all datapoints until the next datapoint, which depends on the same datapoint of the leaf.
+    # Returns the datapoints, the datapoints of the leaf, the sums and the number of datapoints of each sum
+    order = np.lexsort((points, leafPoints))
+    points, leafPoints, g = points[order], leafPoints[order], g[order]
+    first = np.ones(len(points), dtype=bool)
+    first[1:] = leafPoints[1:] != leafPoints[:-1]
+    last = np.roll(first, -1)
+    start = np.flatnonzero(first)
+    c = np.cumsum(g)
+    G = c - np.repeat(c[start] - g[start], np.diff(np.append(start, len(points))))
+    counts = np.where(last, n, np.roll(points, -1)) - points
+    return points, leafPoints, G, counts
+
+
+@implements(np.cumsum)
+def np_cumsum_for_variable(x, *args, **kwargs):
+    n = x.len()
+    cumulative = {leaf: _cumulativeSensitivities(*sensitivities, n) for leaf, sensitivities in x._getSensitivitiesOfLeaves().items()}
+    if sum(np.sum(counts) for _, _, _, counts in cumulative.values()) > _maxCumulativeSensitivities:
+        logger.warning('The cumulative sum of %s datapoints has too many sensitivities. The cumulative sum is not correlated with the leaves of the variable', n)
+        return variable._fromArrays(np.cumsum(x._value), unit(x.unit), np.sqrt(x._getCumulativeVariance()))
+
+    var = variable._fromArrays(np.cumsum(x._value), unit(x.unit))
+    sparseGrad = {}
+    for leaf, (points, leafPoints, G, counts) in cumulative.items():
+        # each sum is repeated for the datapoints until the next datapoint, which depends on the same datapoint of the leaf
+        offsets = np.arange(np.sum(counts)) - np.repeat(np.cumsum(counts) - counts, counts)
+        sparseGrad[leaf] = variable._sumSensitivities([(np.repeat(points, counts) + offsets, np.repeat(leafPoints, counts), np.repeat(G, counts))], leaf.len())
+    var._sparseGrad = sparseGrad
+    var._calculateUncertanty()
+    return var
+
+
+@implements(np.diff)
+def np_diff_for_variable(x, n=1, *args, **kwargs):
+    for _ in range(n):
+        x = x[1:] - x[:-1]
+    return x